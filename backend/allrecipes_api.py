@@ -2,20 +2,31 @@
 Standalone API for AllRecipes instructions
 """
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timezone
+import os
+import hashlib
 import logging
+import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml.etree import XPath
+from selectolax.lexbor import LexborHTMLParser
 import re
-import json
+import orjson
 import sys
+from config.config import active_config
+from utils.orjson_route import ORJSONRoute
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=active_config.LOG_LEVEL,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout)
@@ -23,8 +34,75 @@ logging.basicConfig(
 )
 logger = logging.getLogger("allrecipes_api")
 
+# Extracted instructions cache. Recipe pages rarely change, so entries older
+# than CACHE_TTL are revalidated with a conditional GET rather than refetched;
+# set ALLRECIPES_CACHE_DIR to also persist them across restarts.
+CACHE_SIZE = int(os.getenv("ALLRECIPES_CACHE_SIZE", "2048"))
+CACHE_TTL = int(os.getenv("ALLRECIPES_CACHE_TTL", "86400"))
+CACHE_DIR = os.getenv("ALLRECIPES_CACHE_DIR")
+instructions_cache: "OrderedDict[str, Dict[str, Optional[str]]]" = OrderedDict()
+
+# Pages are streamed and cut off at this size
+MAX_PAGE_BYTES = int(os.getenv("ALLRECIPES_MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
+CHUNK_SIZE = 16384
+
+# Maximum number of pages a batch request fetches at once
+BATCH_CONCURRENCY = int(os.getenv("ALLRECIPES_BATCH_CONCURRENCY", "20"))
+
+# Maximum number of URLs in one batch request; longer batches get a 422
+BATCH_MAX_URLS = int(os.getenv("ALLRECIPES_BATCH_MAX_URLS", "50"))
+
+# Selectors for instruction steps, tried in order
+INSTRUCTION_SELECTORS = tuple(sys.intern(selector) for selector in (
+    ".mntl-sc-block-group--LI",
+    ".directions-container .directions__container ol li",
+    ".recipe-directions__list--item",
+    "[data-testid='recipe-instructions'] li",
+    ".component--instructions"
+))
+
+# Precompiled XPath for the heading fallback
+HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+HEADINGS_XPATH = XPath("//h1|//h2|//h3|//h4|//h5|//h6")
+NEXT_OL_XPATH = XPath("following::ol[1]")
+LI_XPATH = XPath(".//li")
+TEXT_XPATH = XPath(".//text()")
+DIRECTION_HEADINGS = ('directions', 'instructions', 'preparation', 'method', 'steps')
+DIR_SET = frozenset(DIRECTION_HEADINGS)
+DIR_RE = re.compile('|'.join(DIRECTION_HEADINGS), re.I)
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+# Headers to mimic a browser
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Cache-Control": "max-age=0"
+}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create a single HTTP session on startup and close it on shutdown."""
+    app.state.session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60),
+        timeout=aiohttp.ClientTimeout(total=15)
+    )
+    try:
+        yield
+    finally:
+        await app.state.session.close()
+
 # Create FastAPI app
-app = FastAPI(title="AllRecipes API", description="API for extracting recipe instructions from AllRecipes.com")
+app = FastAPI(
+    title="AllRecipes API",
+    description="API for extracting recipe instructions from AllRecipes.com",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+# Parse request bodies with orjson
+app.router.route_class = ORJSONRoute
 
 # Add CORS middleware
 app.add_middleware(
@@ -42,6 +120,82 @@ class RecipeRequest(BaseModel):
 class RecipeResponse(BaseModel):
     instructions: str
 
+class BatchRequest(BaseModel):
+    urls: List[str] = Field(..., max_items=BATCH_MAX_URLS)
+
+class BatchResult(BaseModel):
+    url: str
+    instructions: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchResult]
+
+# Cache management
+def get_cache_key(url: str) -> str:
+    """Content-address a recipe URL."""
+    return hashlib.sha256(url.encode()).hexdigest()
+
+def remember(key: str, entry: Dict[str, Optional[str]]) -> None:
+    """Store an entry in the in-memory LRU, evicting the oldest if full."""
+    instructions_cache[key] = entry
+    instructions_cache.move_to_end(key)
+    while len(instructions_cache) > CACHE_SIZE:
+        instructions_cache.popitem(last=False)
+
+def get_from_cache(url: str) -> Optional[Dict[str, Optional[str]]]:
+    """Get previously extracted instructions for a URL, if any."""
+    key = get_cache_key(url)
+    entry = instructions_cache.get(key)
+    if entry is not None:
+        instructions_cache.move_to_end(key)
+        return entry
+    
+    if CACHE_DIR:
+        try:
+            with open(os.path.join(CACHE_DIR, f"{key}.json"), 'rb') as f:
+                entry = orjson.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        remember(key, entry)
+        return entry
+    
+    return None
+
+def add_to_cache(url: str, instructions: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+    """Add extracted instructions for a URL, with the page's validators, to the cache."""
+    key = get_cache_key(url)
+    entry = {
+        "instructions": instructions,
+        "fetched_at": datetime.now(timezone.utc).isoformat(),
+        "etag": etag,
+        "last_modified": last_modified
+    }
+    remember(key, entry)
+    
+    if CACHE_DIR:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(os.path.join(CACHE_DIR, f"{key}.json"), 'wb') as f:
+                f.write(orjson.dumps(entry))
+        except OSError as e:
+            logger.warning(f"Could not persist cache entry for {url}: {str(e)}")
+
+def is_fresh(entry: Dict[str, Optional[str]]) -> bool:
+    """Check whether a cache entry can be served without revalidation."""
+    fetched_at = datetime.fromisoformat(entry["fetched_at"])
+    return (datetime.now(timezone.utc) - fetched_at).total_seconds() < CACHE_TTL
+
+def conditional_headers(entry: Optional[Dict[str, Optional[str]]]) -> Dict[str, str]:
+    """Build the request headers, revalidating a cached entry if it has validators."""
+    headers = dict(HEADERS)
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint to verify the API is running."""
@@ -60,44 +214,90 @@ async def get_allrecipes_instructions(request: RecipeRequest):
     """
     url = request.url
     
-    if not url or not url.startswith("https://www.allrecipes.com/recipe/"):
+    if not is_allrecipes_url(url):
         logger.error(f"Invalid URL provided: {url}")
         raise HTTPException(status_code=400, detail="Invalid URL. Must be an AllRecipes recipe URL.")
     
+    return RecipeResponse(instructions=await fetch_instructions(url))
+
+@app.post("/api/allrecipes/batch", response_model=BatchResponse)
+async def get_allrecipes_instructions_batch(request: BatchRequest):
+    """
+    Extract recipe instructions from several AllRecipes.com URLs concurrently.
+    
+    Args:
+        request: The request containing the AllRecipes URLs
+        
+    Returns:
+        A result per URL, in request order, with either instructions or an error
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def one(url: str) -> BatchResult:
+        if not is_allrecipes_url(url):
+            return BatchResult(url=url, error="Invalid URL. Must be an AllRecipes recipe URL.")
+        async with semaphore:
+            try:
+                return BatchResult(url=url, instructions=await fetch_instructions(url))
+            except HTTPException as e:
+                return BatchResult(url=url, error=e.detail)
+    
+    logger.info(f"Processing batch of {len(request.urls)} AllRecipes URLs")
+    return BatchResponse(results=await asyncio.gather(*(one(url) for url in request.urls)))
+
+def is_allrecipes_url(url: str) -> bool:
+    """Check that a URL points at an AllRecipes recipe page."""
+    return bool(url) and url.startswith("https://www.allrecipes.com/recipe/")
+
+async def fetch_instructions(url: str) -> str:
+    """
+    Get the instructions for a recipe URL from the cache or by scraping it.
+    
+    Raises:
+        HTTPException: If the page cannot be fetched or has no instructions
+    """
     logger.info(f"Processing AllRecipes URL: {url}")
     
+    cached = get_from_cache(url)
+    if cached and is_fresh(cached):
+        logger.info(f"Cache hit for {url}")
+        return cached["instructions"]
+    
     try:
-        # Set up headers to mimic a browser
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Cache-Control": "max-age=0"
-        }
+        # Fetch the page using the shared session
+        session = app.state.session
+        logger.info(f"Sending HTTP request to {url}")
+        async with session.get(url, headers=conditional_headers(cached)) as response:
+            if response.status == 304 and cached:
+                logger.info(f"Page not modified since last fetch: {url}")
+                add_to_cache(url, cached["instructions"], cached.get("etag"), cached.get("last_modified"))
+                return cached["instructions"]
+            
+            if response.status != 200:
+                logger.error(f"Failed to fetch URL: {url}, status code: {response.status}")
+                raise HTTPException(status_code=502, detail=f"Failed to fetch URL: HTTP {response.status}")
+            
+            logger.info(f"Successfully fetched URL with status code {response.status}")
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            html_content, instructions = await read_page(response)
         
-        # Fetch the page with a timeout
-        async with aiohttp.ClientSession() as session:
-            logger.info(f"Sending HTTP request to {url}")
-            async with session.get(url, headers=headers, timeout=15) as response:
-                if response.status != 200:
-                    logger.error(f"Failed to fetch URL: {url}, status code: {response.status}")
-                    raise HTTPException(status_code=502, detail=f"Failed to fetch URL: HTTP {response.status}")
-                
-                logger.info(f"Successfully fetched URL with status code {response.status}")
-                html_content = await response.text()
-                
-                # Extract instructions using various selectors
-                instructions = await extract_instructions(html_content, url)
-                
-                if not instructions:
-                    logger.error(f"Failed to extract instructions from {url}")
-                    raise HTTPException(status_code=404, detail="Could not extract instructions from the provided URL")
-                
-                logger.info(f"Successfully extracted instructions ({len(instructions)} characters)")
-                return RecipeResponse(instructions=instructions)
+        # Extract instructions using various selectors
+        # Parsing is CPU-bound, so keep it off the event loop
+        if not instructions:
+            loop = asyncio.get_running_loop()
+            instructions = await loop.run_in_executor(None, extract_instructions, html_content, url)
+        
+        if not instructions:
+            logger.error(f"Failed to extract instructions from {url}")
+            raise HTTPException(status_code=404, detail="Could not extract instructions from the provided URL")
+        
+        logger.info(f"Successfully extracted instructions ({len(instructions)} characters)")
+        add_to_cache(url, instructions, etag, last_modified)
+        return instructions
                 
+    except HTTPException:
+        raise
     except aiohttp.ClientError as e:
         logger.error(f"Connection error for URL {url}: {str(e)}")
         raise HTTPException(status_code=502, detail=f"Connection error: {str(e)}")
@@ -108,7 +308,42 @@ async def get_allrecipes_instructions(request: RecipeRequest):
         logger.error(f"Unexpected error processing {url}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
-async def extract_instructions(html_content: str, url: str) -> Optional[str]:
+async def read_page(response: aiohttp.ClientResponse) -> Tuple[str, Optional[str]]:
+    """
+    Stream a page body, stopping at MAX_PAGE_BYTES or as soon as the JSON-LD
+    recipe instructions have been downloaded.
+    
+    Returns:
+        The (possibly partial) HTML and the instructions if they were found early
+    """
+    encoding = response.charset or 'utf-8'
+    buf = bytearray()
+    scan_from = 0
+    
+    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+        buf.extend(chunk)
+        if len(buf) > MAX_PAGE_BYTES:
+            logger.warning(f"Page exceeds {MAX_PAGE_BYTES} bytes, truncating")
+            del buf[MAX_PAGE_BYTES:]
+            break
+        
+        # Try each JSON-LD block as soon as it has fully arrived
+        while True:
+            start = buf.find(b'application/ld+json', scan_from)
+            if start < 0:
+                break
+            end = buf.find(b'</script>', start)
+            if end < 0:
+                break
+            scan_from = end
+            instructions = extract_from_json_ld(buf[start:end + 9].decode(encoding, errors='replace'))
+            if instructions:
+                logger.info("Found instructions in JSON-LD before the end of the page")
+                return "", instructions
+    
+    return buf.decode(encoding, errors='replace'), None
+
+def extract_instructions(html_content: str, url: str) -> Optional[str]:
     """
     Extract recipe instructions from HTML content.
     
@@ -119,128 +354,166 @@ async def extract_instructions(html_content: str, url: str) -> Optional[str]:
     Returns:
         The extracted instructions as a string, or None if extraction failed
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    instructions = ""
-    
-    # Try multiple selectors for instructions
-    selectors = [
-        ".mntl-sc-block-group--LI",
-        ".directions-container .directions__container ol li",
-        ".recipe-directions__list--item",
-        "[data-testid='recipe-instructions'] li",
-        ".component--instructions"
-    ]
+    # AllRecipes ships complete recipeInstructions as JSON-LD, so try that
+    # straight from the raw HTML before building any DOM
+    logger.info("Trying to extract instructions from JSON-LD")
+    instructions = extract_from_json_ld(html_content)
+    if instructions:
+        return instructions
+    
+    tree = LexborHTMLParser(html_content)
     
     # Try to extract instructions using various selectors
-    for selector in selectors:
+    for selector in INSTRUCTION_SELECTORS:
         logger.info(f"Trying selector: {selector}")
-        elements = soup.select(selector)
+        elements = tree.css(selector)
         if elements:
             logger.info(f"Found {len(elements)} elements with selector {selector}")
             instructions_list = []
             for i, element in enumerate(elements, 1):
-                step_text = element.get_text(strip=True)
+                step_text = element.text(strip=True)
                 if step_text:
-                    instructions_list.append(f"{i}. {step_text}")
+                    instructions_list.append("%d. %s" % (i, step_text))
             
             if instructions_list:
                 instructions = "\n".join(instructions_list)
                 logger.info(f"Successfully extracted {len(instructions_list)} steps using selector {selector}")
                 break
     
-    # If no instructions found with selectors, try to extract from JSON-LD
-    if not instructions:
-        logger.info("Trying to extract instructions from JSON-LD")
-        instructions = extract_from_json_ld(soup)
-    
-    # If still no instructions, try to find a directions section
-    if not instructions:
+    # If still no instructions, try to find a directions section. lxml
+    # refuses to parse an empty document, and a blank page has no recipe
+    if not instructions and html_content.strip():
         logger.info("Trying to find directions section by heading")
-        instructions = find_directions_section(soup)
+        instructions = find_directions_section(lxml.html.fromstring(html_content.encode('utf-8'), parser=HTML_PARSER))
     
     return instructions
 
-def extract_from_json_ld(soup: BeautifulSoup) -> Optional[str]:
-    """Extract recipe instructions from JSON-LD structured data."""
+def iter_ldjson(html: str):
+    """Yield the bodies of application/ld+json script tags using plain string scans."""
+    needle = 'application/ld+json'
+    i = 0
+    while True:
+        j = html.find(needle, i)
+        if j < 0:
+            return
+        gt = html.find('>', j)
+        if gt < 0:
+            return
+        end = html.find('</script>', gt)
+        if end < 0:
+            return
+        yield html[gt + 1:end]
+        i = end
+
+def extract_from_json_ld(html_content: str) -> Optional[str]:
+    """Extract recipe instructions from JSON-LD script blocks in the raw HTML."""
     try:
-        for script in soup.find_all('script', type='application/ld+json'):
+        for block in iter_ldjson(html_content):
             try:
-                data = json.loads(script.string)
-                
-                # Handle both single recipe and array of recipes
-                recipes = data if isinstance(data, list) else [data]
-                
-                for item in recipes:
-                    if '@type' in item and item['@type'] in ['Recipe', 'schema:Recipe']:
-                        if 'recipeInstructions' in item:
-                            instructions = item['recipeInstructions']
-                            
-                            # Handle different formats of recipeInstructions
-                            if isinstance(instructions, list):
-                                # Check if it's a list of objects with text property
-                                if all(isinstance(step, dict) for step in instructions):
-                                    steps = []
-                                    for i, step in enumerate(instructions, 1):
-                                        if 'text' in step:
-                                            steps.append(f"{i}. {step['text']}")
-                                    return "\n".join(steps) if steps else None
-                                # Check if it's a list of strings
-                                elif all(isinstance(step, str) for step in instructions):
-                                    return "\n".join(f"{i}. {step}" for i, step in enumerate(instructions, 1))
-                            # Handle string format
-                            elif isinstance(instructions, str):
-                                # Split by newlines or periods followed by space
-                                steps = re.split(r'(?:\.\s+|\n+)', instructions)
-                                steps = [step.strip() for step in steps if step.strip()]
-                                return "\n".join(f"{i}. {step}" for i, step in enumerate(steps, 1))
-            except json.JSONDecodeError:
+                data = orjson.loads(block)
+            except orjson.JSONDecodeError:
                 logger.warning("Failed to parse JSON-LD data")
                 continue
+            
+            instructions = instructions_from_json_ld(data)
+            if instructions:
+                return instructions
     except Exception as e:
         logger.warning(f"Error extracting from JSON-LD: {str(e)}")
     
     return None
 
-def find_directions_section(soup: BeautifulSoup) -> Optional[str]:
-    """Find directions section by looking for headings like 'Directions' or 'Instructions'."""
-    direction_headings = ['directions', 'instructions', 'preparation', 'method', 'steps']
+def instructions_from_json_ld(data) -> Optional[str]:
+    """Format the recipeInstructions of a parsed JSON-LD document."""
+    # Handle both single recipe and array of recipes
+    recipes = data if isinstance(data, list) else [data]
     
+    for item in recipes:
+        if '@type' in item and item['@type'] in ['Recipe', 'schema:Recipe']:
+            if 'recipeInstructions' in item:
+                instructions = item['recipeInstructions']
+                
+                # Handle different formats of recipeInstructions
+                if isinstance(instructions, list):
+                    # Check if it's a list of objects with text property
+                    if all(isinstance(step, dict) for step in instructions):
+                        steps = []
+                        for i, step in enumerate(instructions, 1):
+                            if 'text' in step:
+                                steps.append("%d. %s" % (i, step['text']))
+                        return "\n".join(steps) if steps else None
+                    # Check if it's a list of strings
+                    elif all(isinstance(step, str) for step in instructions):
+                        return "\n".join("%d. %s" % (i, step) for i, step in enumerate(instructions, 1))
+                # Handle string format
+                elif isinstance(instructions, str):
+                    # Split by newlines or periods followed by space
+                    steps = []
+                    for line in instructions.split('\n'):
+                        for sentence in line.split('. '):
+                            step = sentence.strip()
+                            if step:
+                                steps.append(step)
+                    return "\n".join("%d. %s" % (i, step) for i, step in enumerate(steps, 1))
+    
+    return None
+
+def element_text(element) -> str:
+    """Concatenate the stripped text nodes under an lxml element."""
+    # Leaf elements hold all their text directly
+    if len(element) == 0:
+        return (element.text or "").strip()
+    return "".join(text.strip() for text in TEXT_XPATH(element))
+
+def find_directions_section(root) -> Optional[str]:
+    """Find directions section by looking for headings like 'Directions' or 'Instructions'."""
     # Look for headings
-    for heading in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-        heading_text = heading.get_text(strip=True).lower()
+    for heading in HEADINGS_XPATH(root):
+        heading_text = element_text(heading)
         
-        if any(dh in heading_text for dh in direction_headings):
+        # Most direction headings are exactly one of the keywords
+        if heading_text.lower() in DIR_SET or DIR_RE.search(heading_text):
             logger.info(f"Found directions heading: {heading_text}")
             
             # Look for ordered list after the heading
-            ol = heading.find_next('ol')
-            if ol:
+            following = NEXT_OL_XPATH(heading)
+            if following:
                 steps = []
-                for i, li in enumerate(ol.find_all('li'), 1):
-                    step_text = li.get_text(strip=True)
+                for i, li in enumerate(LI_XPATH(following[0]), 1):
+                    step_text = element_text(li)
                     if step_text:
-                        steps.append(f"{i}. {step_text}")
+                        steps.append("%d. %s" % (i, step_text))
                 
                 if steps:
                     return "\n".join(steps)
             
             # If no ordered list, look for paragraphs or divs
             steps = []
-            next_elem = heading.find_next_sibling()
-            while next_elem and next_elem.name not in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                if next_elem.name in ['p', 'div']:
-                    step_text = next_elem.get_text(strip=True)
+            next_elem = heading.getnext()
+            while next_elem is not None and next_elem.tag not in HEADING_TAGS:
+                if next_elem.tag in ['p', 'div']:
+                    step_text = element_text(next_elem)
                     if step_text:
                         steps.append(step_text)
-                next_elem = next_elem.find_next_sibling()
+                next_elem = next_elem.getnext()
             
             if steps:
-                return "\n".join(f"{i}. {step}" for i, step in enumerate(steps, 1))
+                return "\n".join("%d. %s" % (i, step) for i, step in enumerate(steps, 1))
     
     logger.warning("Could not find directions section")
     return None
 
 if __name__ == "__main__":
-    import asyncio
-    
-    uvicorn.run(app, host="0.0.0.0", port=8002) 
\ No newline at end of file
+    # Extraction is CPU-bound, so run one worker per core. uvicorn picks up
+    # uvloop and httptools automatically when they are installed.
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    uvicorn.run(
+        "allrecipes_api:app",
+        host="0.0.0.0",
+        port=8002,
+        loop="auto",
+        http="auto",
+        workers=workers,
+        log_level=active_config.LOG_LEVEL.lower(),
+        access_log=active_config.DEBUG
+    ) 
\ No newline at end of file
@@ -1,19 +1,23 @@
 import os
 import logging
 import sys
+import functools
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+from flask_compress import Compress
 from dotenv import load_dotenv
-from services.recipe_service import get_recipes_by_ingredients, get_recipe_details, search_recipes, get_random_recipes
+from services import edamam_service, recipe_service
+from services.recipe_service import get_recipes_by_ingredients, get_recipe_details, search_recipes, get_random_recipes, normalize_ingredients
 from services.user_service import get_user, get_user_favorites, add_favorite, remove_favorite, update_user_preferences, get_user_preferences
 from routes.chat_routes import chat_bp
 from routes.recipe_routes import recipe_bp
 from routes.video_routes import video_bp
 from routes.shopping_list_routes import shopping_list_bp
 from routes.saved_recipes_routes import saved_recipes_bp
-from fastapi import Request
-from fastapi.responses import JSONResponse
-from recipe_instructions_service import get_recipe_instructions
+from utils.json_provider import OrjsonProvider
+from config.config import active_config
+from utils.http_cache import etag_response
+from utils.logger import setup_queue_logging
 import traceback
 import datetime
 
@@ -23,27 +27,27 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Load environment variables
 load_dotenv()
 
-# Force API_PROVIDER to be 'edamam'
-os.environ['API_PROVIDER'] = 'edamam'
-
-# Print environment variables for debugging
-print(f"API_PROVIDER: {os.getenv('API_PROVIDER', 'edamam')}")
-print(f"EDAMAM_API_KEY: {os.getenv('EDAMAM_API_KEY', 'not set')}")
-print(f"EDAMAM_APP_ID: {os.getenv('EDAMAM_APP_ID', 'not set')}")
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Configure logging; records are written by a background thread
+setup_queue_logging(active_config.LOG_LEVEL)
 logger = logging.getLogger("recipe_app")
 
+@functools.lru_cache(maxsize=1)
+def _instructions_service():
+    """Import the recipe instructions service, with its FastAPI and OpenAI dependencies, on first use."""
+    import recipe_instructions_service
+    return recipe_instructions_service
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
+# Compress JSON responses over 1 KB (br or gzip, whichever the client accepts)
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 5
+app.config['COMPRESS_BR_LEVEL'] = 5
+app.config['COMPRESS_MIN_SIZE'] = 1024
+Compress(app)
+
 # Register blueprints
 app.register_blueprint(recipe_bp, url_prefix='/api/recipes')
 app.register_blueprint(chat_bp, url_prefix='/api/chat')
@@ -51,93 +55,83 @@ app.register_blueprint(video_bp, url_prefix='/api/videos')
 app.register_blueprint(shopping_list_bp, url_prefix='/api/shopping-list')
 app.register_blueprint(saved_recipes_bp)
 
-# Add a test endpoint to check if the edamam_service is being imported correctly
-@app.route('/api/test-edamam', methods=['GET'])
-def test_edamam():
-    """Test endpoint to verify Edamam API connectivity"""
-    try:
-        # Import the Edamam service
-        from services.edamam_service import search
-        
-        # Try to search for a simple query
-        results = search("pasta", 1)
-        
-        # Return success with the results
-        return jsonify({
-            "success": True,
-            "message": "Edamam API is working correctly",
-            "results": results
-        })
-    except Exception as e:
-        # Log the error
-        app.logger.error(f"Error testing Edamam API: {str(e)}")
-        
-        # Return error response
-        return jsonify({
-            "success": False,
-            "message": f"Error testing Edamam API: {str(e)}"
-        }), 500
+# Diagnostic endpoints, only registered when running with DEBUG
+if active_config.DEBUG:
+    # Add a test endpoint to check if the edamam_service is being imported correctly
+    @app.route('/api/test-edamam', methods=['GET'])
+    def test_edamam():
+        """Test endpoint to verify Edamam API connectivity"""
+        try:
+            # Try to search for a simple query
+            results = edamam_service.search_recipes("pasta", number=1)
 
-# Add a test endpoint to check if the recipe_service is being used correctly
-@app.route('/api/test-recipe-service', methods=['GET'])
-def test_recipe_service():
-    try:
-        import services.recipe_service as recipe_service
-        return jsonify({
-            "success": True,
-            "message": "Recipe service imported successfully",
-            "api_provider": recipe_service.API_PROVIDER
-        })
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "message": f"Error importing recipe_service: {str(e)}"
-        })
+            # Return success with the results
+            return jsonify({
+                "success": True,
+                "message": "Edamam API is working correctly",
+                "results": results
+            })
+        except Exception as e:
+            # Log the error
+            app.logger.error(f"Error testing Edamam API: {str(e)}")
 
-# Add a direct test endpoint for random recipes
-@app.route('/api/test-random-recipes', methods=['GET'])
-def test_random_recipes():
-    try:
-        import services.recipe_service as recipe_service
-        result = recipe_service.get_random_recipes(number=2)
-        return jsonify({
-            "success": True,
-            "message": "Random recipes retrieved successfully",
-            "api_provider": recipe_service.API_PROVIDER,
-            "recipes": result
-        })
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "message": f"Error getting random recipes: {str(e)}"
-        })
+            # Return error response
+            return jsonify({
+                "success": False,
+                "message": f"Error testing Edamam API: {str(e)}"
+            }), 500
 
-# Add a direct test endpoint for the edamam_service
-@app.route('/api/test-edamam-direct', methods=['GET'])
-def test_edamam_direct():
-    try:
-        import services.edamam_service as edamam_service
-        result = edamam_service.get_random_recipes(number=2)
-        
-        # Print the result for debugging
-        print(f"Result type: {type(result)}")
-        print(f"Result length: {len(result)}")
-        if result:
-            print(f"First recipe: {result[0].get('title', 'No title')}")
-        
-        return jsonify({
-            "success": True,
-            "message": "Edamam random recipes retrieved successfully",
-            "recipes": result,
-            "recipe_count": len(result),
-            "recipe_titles": [r.get('title', 'No title') for r in result]
-        })
-    except Exception as e:
-        print(f"Error in test_edamam_direct: {str(e)}")
-        return jsonify({
-            "success": False,
-            "message": f"Error getting Edamam random recipes: {str(e)}"
-        })
+    # Add a test endpoint to check if the recipe_service is being used correctly
+    @app.route('/api/test-recipe-service', methods=['GET'])
+    def test_recipe_service():
+        try:
+            return jsonify({
+                "success": True,
+                "message": "Recipe service imported successfully",
+                "api_provider": recipe_service.API_PROVIDER
+            })
+        except Exception as e:
+            return jsonify({
+                "success": False,
+                "message": f"Error importing recipe_service: {str(e)}"
+            })
+
+    # Add a direct test endpoint for random recipes
+    @app.route('/api/test-random-recipes', methods=['GET'])
+    def test_random_recipes():
+        try:
+            result = recipe_service.get_random_recipes(number=2)
+            return jsonify({
+                "success": True,
+                "message": "Random recipes retrieved successfully",
+                "api_provider": recipe_service.API_PROVIDER,
+                "recipes": result
+            })
+        except Exception as e:
+            return jsonify({
+                "success": False,
+                "message": f"Error getting random recipes: {str(e)}"
+            })
+
+    # Add a direct test endpoint for the edamam_service
+    @app.route('/api/test-edamam-direct', methods=['GET'])
+    def test_edamam_direct():
+        try:
+            result = edamam_service.get_random_recipes(number=2)
+
+            return jsonify({
+                "success": True,
+                "message": "Edamam random recipes retrieved successfully",
+                "recipes": result,
+                "recipe_count": len(result),
+                "recipe_titles": [r.get('title', 'No title') for r in result]
+            })
+        except Exception as e:
+            app.logger.error(f"Error in test_edamam_direct: {str(e)}")
+            return jsonify({
+                "success": False,
+                "message": f"Error getting Edamam random recipes: {str(e)}"
+            })
 
 # Recipe endpoints
 @app.route('/api/recipes/ingredients', methods=['GET', 'POST'])
@@ -154,15 +148,15 @@ def recipes_by_ingredients():
         if not ingredients or not isinstance(ingredients, list):
             return jsonify({"error": "Ingredients must be a non-empty list"}), 400
         
-        # Clean ingredients
-        ingredients_list = [ingredient.strip().lower() for ingredient in ingredients if isinstance(ingredient, str) and ingredient.strip()]
+        # Clean and dedupe ingredients
+        ingredients_list = normalize_ingredients(ingredients)
     else:  # GET request
         ingredients = request.args.get('ingredients', '')
         if not ingredients:
             return jsonify({"error": "No ingredients provided"}), 400
         
         # Split comma-separated ingredients
-        ingredients_list = [i.strip().lower() for i in ingredients.split(',') if i.strip()]
+        ingredients_list = normalize_ingredients(ingredients.split(','))
     
     # Validate final ingredients list
     if not ingredients_list:
@@ -231,7 +225,7 @@ def random_recipes():
     
     try:
         recipes = get_random_recipes(tags)
-        return jsonify(recipes)
+        return etag_response(recipes)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -239,7 +233,7 @@ def random_recipes():
 def recipe_details(recipe_id):
     try:
         recipe = get_recipe_details(recipe_id)
-        return jsonify(recipe)
+        return etag_response(recipe, max_age=60)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -248,7 +242,7 @@ def recipe_details(recipe_id):
 def get_user_route(user_id):
     try:
         user = get_user(user_id)
-        return jsonify(user.to_dict())
+        return etag_response(user.to_dict())
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -260,7 +254,7 @@ def get_favorites_route(user_id):
     
     try:
         favorites = get_user_favorites(user_id, limit, sort_by, reverse)
-        return jsonify(favorites)
+        return etag_response(favorites)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -296,56 +290,6 @@ def update_preferences_route(user_id):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-# Start Recipe Instructions Service automatically
-def start_recipe_instructions_service():
-    import subprocess
-    import threading
-    import sys
-    
-    def run_service():
-        try:
-            print("Starting Recipe Instructions Service...")
-            # Using uvicorn to run the FastAPI app
-            cmd = [sys.executable, "-m", "uvicorn", "recipe_instructions_service:app", "--host", "0.0.0.0", "--port", "8003"]
-            subprocess.Popen(cmd, cwd=os.path.dirname(os.path.abspath(__file__)))
-            print("Recipe Instructions Service started successfully on http://localhost:8003")
-        except Exception as e:
-            print(f"Error starting Recipe Instructions Service: {str(e)}")
-    
-    # Start in a separate thread so it doesn't block the Flask app
-    try:
-        service_thread = threading.Thread(target=run_service)
-        service_thread.daemon = True  # This ensures the thread will be killed when the main process exits
-        service_thread.start()
-    except Exception as e:
-        print(f"Warning: Could not start Recipe Instructions Service: {str(e)}")
-        print("The main API will continue to run but recipe instructions may not be available.")
-
-# Start AllRecipes API automatically
-def start_allrecipes_api():
-    import subprocess
-    import threading
-    import sys
-    
-    def run_service():
-        try:
-            print("Starting AllRecipes API...")
-            # Using uvicorn to run the FastAPI app
-            cmd = [sys.executable, "-m", "uvicorn", "allrecipes_api:app", "--host", "0.0.0.0", "--port", "8002"]
-            subprocess.Popen(cmd, cwd=os.path.dirname(os.path.abspath(__file__)))
-            print("AllRecipes API started successfully on http://localhost:8002")
-        except Exception as e:
-            print(f"Error starting AllRecipes API: {str(e)}")
-    
-    # Start in a separate thread so it doesn't block the Flask app
-    try:
-        service_thread = threading.Thread(target=run_service)
-        service_thread.daemon = True  # This ensures the thread will be killed when the main process exits
-        service_thread.start()
-    except Exception as e:
-        print(f"Warning: Could not start AllRecipes API: {str(e)}")
-        print("The main API will continue to run but AllRecipes parsing may not be available.")
-
 # Exception handlers
 @app.errorhandler(Exception)
 def global_exception_handler(exc):
@@ -397,7 +341,7 @@ def recipe_instructions():
         return jsonify({"error": "URL parameter is required"}), 400
     
     try:
-        instructions_data = get_recipe_instructions(url, recipe_id)
+        instructions_data = _instructions_service().get_recipe_instructions(url, recipe_id)
         return jsonify(instructions_data)
     except Exception as e:
         logger.error(f"Error getting recipe instructions: {str(e)}")
@@ -409,16 +353,25 @@ def recipe_instructions():
         }), 500
 
 if __name__ == '__main__':
-    # Start recipe instructions service before starting the Flask app
-    try:
-        start_recipe_instructions_service()
-        start_allrecipes_api()
-        
-        # Give the services a moment to start up
-        import time
-        time.sleep(2)
-    except Exception as e:
-        print(f"Warning: Error starting backend services: {str(e)}")
-        print("The main API will continue to run but some features may not be available.")
+    import uvicorn
+    
+    # Serve the Flask API together with the AllRecipes and recipe instructions
+    # services from a single process (see asgi.py)
+    if active_config.DEBUG:
+        # Reloading needs an import string; the reloaded worker imports this
+        # module once, as app
+        asgi_app = "asgi:app"
+    else:
+        # asgi.py imports app; hand it this module rather than importing
+        # app.py a second time
+        sys.modules.setdefault('app', sys.modules[__name__])
+        from asgi import app as asgi_app
     
-    app.run(debug=True, host='0.0.0.0', port=int(os.environ.get('PORT', 5000))) 
\ No newline at end of file
+    uvicorn.run(
+        asgi_app,
+        host='0.0.0.0',
+        port=int(os.environ.get('PORT', 5000)),
+        log_level=active_config.LOG_LEVEL.lower(),
+        access_log=active_config.DEBUG,
+        reload=active_config.DEBUG
+    )
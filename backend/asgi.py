@@ -0,0 +1,47 @@
+"""
+Single ASGI entry point for the backend.
+
+Serves the Flask API together with the AllRecipes and recipe instructions
+services in one process, instead of spawning them as separate uvicorn
+subprocesses on ports 8002/8003.
+"""
+import os
+from contextlib import AsyncExitStack, asynccontextmanager
+import anyio.to_thread
+from fastapi import FastAPI
+from fastapi.middleware.wsgi import WSGIMiddleware
+
+import allrecipes_api
+import recipe_instructions_service
+from app import app as flask_app
+
+# Service apps and the routes they own in the combined app
+SERVICES = (
+    (allrecipes_api.app, "/api/allrecipes"),
+    (allrecipes_api.app, "/api/allrecipes/batch"),
+    (recipe_instructions_service.app, "/api/recipe-instructions"),
+)
+
+# Flask requests run in the worker thread pool while they wait on upstream
+# APIs, so its size caps how many of those calls can be in flight at once
+THREADPOOL_SIZE = int(os.getenv("ASGI_THREADPOOL_SIZE", "100"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the lifespan of each service app, which Starlette does not do for sub-apps."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    async with AsyncExitStack() as stack:
+        # A service serving several routes is listed once per route; start it once
+        for service in dict.fromkeys(service for service, _ in SERVICES):
+            await stack.enter_async_context(service.router.lifespan_context(service))
+        yield
+
+app = FastAPI(title="AI-Powered Recipe Recommender", lifespan=lifespan)
+
+# Hand the service routes to their own apps so their middleware and error
+# handlers still apply. OPTIONS is included so CORS preflights reach them.
+for service, path in SERVICES:
+    app.add_route(path, service, methods=["POST", "OPTIONS"])
+
+# Everything else is served by the Flask app
+app.mount("/", WSGIMiddleware(flask_app))
@@ -1,38 +1,51 @@
 import os
+from dataclasses import dataclass, field
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+def _env(name, default=None, secret=False):
+    """Read an environment variable when the config is built, keeping secrets out of repr."""
+    return field(default_factory=lambda: os.getenv(name, default), repr=not secret)
+
+@dataclass(frozen=True)
 class Config:
     """Base configuration class"""
-    DEBUG = False
-    TESTING = False
-    SECRET_KEY = os.getenv('SECRET_KEY', 'dev-key-for-development-only')
-    
+    DEBUG: bool = False
+    TESTING: bool = False
+    SECRET_KEY: str = _env('SECRET_KEY', 'dev-key-for-development-only', secret=True)
+    LOG_LEVEL: str = field(default_factory=lambda: os.getenv('LOG_LEVEL', 'WARNING').upper())
+
     # API Keys
-    OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-    EDAMAM_API_KEY = os.getenv('EDAMAM_API_KEY')
-    EDAMAM_APP_ID = os.getenv('EDAMAM_APP_ID')
-    
-    # API Base URLs
-    EDAMAM_BASE_URL = 'https://api.edamam.com'
+    OPENAI_API_KEY: str = _env('OPENAI_API_KEY', secret=True)
+    EDAMAM_API_KEY: str = _env('EDAMAM_API_KEY', secret=True)
+    EDAMAM_APP_ID: str = _env('EDAMAM_APP_ID')
+
+    # API Provider and Base URLs
+    API_PROVIDER: str = _env('API_PROVIDER', 'edamam')
+    EDAMAM_BASE_URL: str = 'https://api.edamam.com'
 
+@dataclass(frozen=True)
 class DevelopmentConfig(Config):
     """Development configuration"""
-    DEBUG = True
+    DEBUG: bool = True
+    LOG_LEVEL: str = field(default_factory=lambda: os.getenv('LOG_LEVEL', 'INFO').upper())
 
+@dataclass(frozen=True)
 class TestingConfig(Config):
     """Testing configuration"""
-    TESTING = True
-    DEBUG = True
+    TESTING: bool = True
+    DEBUG: bool = True
+    LOG_LEVEL: str = field(default_factory=lambda: os.getenv('LOG_LEVEL', 'INFO').upper())
 
+@dataclass(frozen=True)
 class ProductionConfig(Config):
     """Production configuration"""
     # Production-specific settings
     pass
 
-# Dictionary to map environment names to config objects
+# Dictionary to map environment names to config classes
 config_by_name = {
     'development': DevelopmentConfig,
     'testing': TestingConfig,
@@ -42,5 +55,5 @@ config_by_name = {
 # Get the current environment or default to development
 ENV = os.getenv('FLASK_ENV', 'development')
 
-# Export the active configuration
-active_config = config_by_name[ENV] 
\ No newline at end of file
+# Export the active configuration, built once
+active_config = config_by_name[ENV]()
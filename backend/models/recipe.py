@@ -1,11 +1,26 @@
 import datetime
-from flask import current_app
+import logging
+import operator
+
+logger = logging.getLogger(__name__)
+
+# Attributes serialized by Recipe.to_dict, in output order
+FIELDS = (
+    'id', 'title', 'image', 'source_url', 'source_name', 'ready_in_minutes',
+    'servings', 'summary', 'instructions', 'ingredients', 'nutrition',
+    'cuisines', 'diets', 'dish_types', 'occasions', 'likes',
+    'used_ingredients', 'missed_ingredients', 'unused_ingredients', 'created_at'
+)
+_get_fields = operator.attrgetter(*FIELDS)
 
 class Recipe:
     """
     Model representing a recipe with standardized attributes
     """
     
+    # created_at is a property over _created_at, the last entry in FIELDS
+    __slots__ = FIELDS[:-1] + ('_created_at',)
+    
     def __init__(self, id, title, image=None, source_url=None, source_name=None, 
                  ready_in_minutes=None, servings=None, summary=None, instructions=None,
                  ingredients=None, nutrition=None, cuisines=None, diets=None, 
@@ -54,7 +69,19 @@ class Recipe:
         self.used_ingredients = used_ingredients or []
         self.missed_ingredients = missed_ingredients or []
         self.unused_ingredients = unused_ingredients or []
-        self.created_at = datetime.datetime.now().isoformat()
+        self._created_at = None
+    
+    @property
+    def created_at(self):
+        """
+        Timestamp of the recipe, taken the first time it is read
+        
+        Returns:
+            ISO 8601 timestamp string
+        """
+        if self._created_at is None:
+            self._created_at = datetime.datetime.now().isoformat()
+        return self._created_at
     
     @classmethod
     def from_api_response(cls, data):
@@ -83,37 +110,22 @@ class Recipe:
                 servings=data.get('servings'),
                 summary=data.get('summary'),
                 instructions=data.get('instructions'),
+                ingredients=data.get('extendedIngredients'),
+                nutrition=data.get('nutrition'),
+                cuisines=data.get('cuisines'),
+                diets=data.get('diets'),
+                dish_types=data.get('dishTypes'),
+                occasions=data.get('occasions'),
                 likes=data.get('likes'),
-                used_ingredients=data.get('usedIngredients', []),
-                missed_ingredients=data.get('missedIngredients', []),
-                unused_ingredients=data.get('unusedIngredients', [])
+                used_ingredients=data.get('usedIngredients'),
+                missed_ingredients=data.get('missedIngredients'),
+                unused_ingredients=data.get('unusedIngredients')
             )
             
-            # Extract ingredients if available
-            if 'extendedIngredients' in data:
-                recipe.ingredients = data['extendedIngredients']
-            
-            # Extract nutrition information if available
-            if 'nutrition' in data:
-                recipe.nutrition = data['nutrition']
-            
-            # Extract additional information if available
-            if 'cuisines' in data:
-                recipe.cuisines = data['cuisines']
-            
-            if 'diets' in data:
-                recipe.diets = data['diets']
-            
-            if 'dishTypes' in data:
-                recipe.dish_types = data['dishTypes']
-            
-            if 'occasions' in data:
-                recipe.occasions = data['occasions']
-            
             return recipe
         
-        except Exception as e:
-            current_app.logger.error(f"Error creating Recipe from API response: {str(e)}")
+        except Exception:
+            logger.exception("Error creating Recipe from API response")
             # Return a minimal Recipe object with available data
             return cls(
                 id=data.get('id', 0),
@@ -127,28 +139,7 @@ class Recipe:
         Returns:
             Dictionary representation of Recipe
         """
-        return {
-            'id': self.id,
-            'title': self.title,
-            'image': self.image,
-            'source_url': self.source_url,
-            'source_name': self.source_name,
-            'ready_in_minutes': self.ready_in_minutes,
-            'servings': self.servings,
-            'summary': self.summary,
-            'instructions': self.instructions,
-            'ingredients': self.ingredients,
-            'nutrition': self.nutrition,
-            'cuisines': self.cuisines,
-            'diets': self.diets,
-            'dish_types': self.dish_types,
-            'occasions': self.occasions,
-            'likes': self.likes,
-            'used_ingredients': self.used_ingredients,
-            'missed_ingredients': self.missed_ingredients,
-            'unused_ingredients': self.unused_ingredients,
-            'created_at': self.created_at
-        }
+        return dict(zip(FIELDS, _get_fields(self)))
     
     def __str__(self):
         """
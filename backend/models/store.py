@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+DB_PATH = os.getenv("APP_DB_PATH", os.path.join(DATA_DIR, "app.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS favorites (
+    user_id TEXT NOT NULL,
+    recipe_id TEXT NOT NULL,
+    added_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (user_id, recipe_id)
+);
+CREATE TABLE IF NOT EXISTS preferences (
+    user_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL
+);
+"""
+
+_connection = None
+_connection_lock = threading.Lock()
+
+def get_connection():
+    """
+    Get the shared SQLite connection, opening it on first use.
+
+    The connection is in autocommit mode and shared across threads, so
+    callers should hold `lock` while using it.
+
+    Returns:
+        sqlite3.Connection: The database connection
+    """
+    global _connection
+    if _connection is None:
+        with _connection_lock:
+            if _connection is None:
+                os.makedirs(os.path.dirname(DB_PATH) or ".", exist_ok=True)
+                connection = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                connection.executescript(SCHEMA)
+                logger.info(f"Opened database at {DB_PATH}")
+                _connection = connection
+    return _connection
+
+# Serializes access to the shared connection
+lock = threading.Lock()
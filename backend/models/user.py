@@ -1,13 +1,18 @@
 import os
-import json
+import orjson
 import logging
 import time
 from datetime import datetime
+from heapq import nlargest, nsmallest
+from models import store
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Where favorites were kept before they moved to the database
+LEGACY_FAVORITES_DIR = os.path.join(store.DATA_DIR, "users")
+
 class User:
     """
     User model for storing user data and favorites.
@@ -28,56 +33,72 @@ class User:
             "intolerances": [],
             "cuisines": []
         }
+        self._load_preferences()
         self.favorites = []
+        self._favorites_path = os.path.join(LEGACY_FAVORITES_DIR, f"{self.id}_favorites.json")
         self._load_favorites()
-    
-    def _get_favorites_path(self):
-        """
-        Get the path to the user's favorites file.
-        
-        Returns:
-            str: Path to the favorites file
-        """
-        # Create data directory if it doesn't exist
-        data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-        if not os.path.exists(data_dir):
-            os.makedirs(data_dir)
-        
-        # Create user directory if it doesn't exist
-        user_dir = os.path.join(data_dir, "users")
-        if not os.path.exists(user_dir):
-            os.makedirs(user_dir)
         
-        return os.path.join(user_dir, f"{self.id}_favorites.json")
+        # Favorites by recipe ID, for constant-time membership checks
+        self._fav_index = {str(fav.get('id')): fav for fav in self.favorites}
     
     def _load_favorites(self):
         """
-        Load favorites from file.
+        Load favorites from the database.
         """
         try:
-            favorites_path = self._get_favorites_path()
-            if os.path.exists(favorites_path):
-                with open(favorites_path, 'r') as f:
-                    self.favorites = json.load(f)
-                logger.info(f"Loaded {len(self.favorites)} favorites for user {self.id}")
-            else:
-                logger.info(f"No favorites file found for user {self.id}")
-                self.favorites = []
+            connection = store.get_connection()
+            with store.lock:
+                rows = connection.execute(
+                    "SELECT payload FROM favorites WHERE user_id = ? ORDER BY added_at",
+                    (str(self.id),)
+                ).fetchall()
+            self.favorites = [orjson.loads(payload) for (payload,) in rows]
+            
+            if not self.favorites:
+                self._import_legacy_favorites()
+            logger.info(f"Loaded {len(self.favorites)} favorites for user {self.id}")
         except Exception as e:
             logger.error(f"Error loading favorites for user {self.id}: {str(e)}")
             self.favorites = []
     
-    def _save_favorites(self):
+    def _load_preferences(self):
         """
-        Save favorites to file.
+        Load saved preferences from the database.
         """
         try:
-            favorites_path = self._get_favorites_path()
-            with open(favorites_path, 'w') as f:
-                json.dump(self.favorites, f, indent=2)
-            logger.info(f"Saved {len(self.favorites)} favorites for user {self.id}")
+            connection = store.get_connection()
+            with store.lock:
+                row = connection.execute(
+                    "SELECT payload FROM preferences WHERE user_id = ?",
+                    (str(self.id),)
+                ).fetchone()
+            if row:
+                self.preferences.update(orjson.loads(row[0]))
         except Exception as e:
-            logger.error(f"Error saving favorites for user {self.id}: {str(e)}")
+            logger.error(f"Error loading preferences for user {self.id}: {str(e)}")
+    
+    def _import_legacy_favorites(self):
+        """
+        Move favorites from the user's old JSON file into the database.
+        """
+        favorites_path = self._favorites_path
+        if not os.path.exists(favorites_path):
+            return
+        
+        with open(favorites_path, 'rb') as f:
+            favorites = orjson.loads(f.read())
+        
+        connection = store.get_connection()
+        with store.lock:
+            connection.executemany(
+                "INSERT OR IGNORE INTO favorites (user_id, recipe_id, added_at, payload) VALUES (?, ?, ?, ?)",
+                [(str(self.id), str(fav.get('id')), fav.get('added_at', 0), orjson.dumps(fav).decode()) for fav in favorites]
+            )
+        
+        # Keep the old file around, but make sure it is not imported again
+        os.replace(favorites_path, f"{favorites_path}.migrated")
+        self.favorites = favorites
+        logger.info(f"Imported {len(favorites)} favorites from {favorites_path} for user {self.id}")
     
     def add_favorite(self, recipe):
         """
@@ -89,18 +110,29 @@ class User:
         Returns:
             bool: True if added successfully, False if already in favorites
         """
+        recipe_id = str(recipe.get('id'))
+        
         # Check if recipe is already in favorites
-        for fav in self.favorites:
-            if fav.get('id') == recipe.get('id'):
-                logger.info(f"Recipe {recipe.get('id')} already in favorites for user {self.id}")
-                return False
+        if recipe_id in self._fav_index:
+            logger.info(f"Recipe {recipe.get('id')} already in favorites for user {self.id}")
+            return False
         
-        # Add timestamp
-        recipe['added_at'] = time.time()
+        added_at = time.time()
+        connection = store.get_connection()
+        with store.lock:
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO favorites (user_id, recipe_id, added_at, payload) VALUES (?, ?, ?, ?)",
+                (str(self.id), recipe_id, added_at, orjson.dumps({**recipe, 'added_at': added_at}).decode())
+            )
+        
+        if cursor.rowcount == 0:
+            logger.info(f"Recipe {recipe.get('id')} already in favorites for user {self.id}")
+            return False
         
-        # Add to favorites and save
+        # Add timestamp
+        recipe['added_at'] = added_at
         self.favorites.append(recipe)
-        self._save_favorites()
+        self._fav_index[recipe_id] = recipe
         logger.info(f"Added recipe {recipe.get('id')} to favorites for user {self.id}")
         return True
     
@@ -114,16 +146,20 @@ class User:
         Returns:
             bool: True if removed successfully, False if not in favorites
         """
-        initial_count = len(self.favorites)
-        self.favorites = [fav for fav in self.favorites if str(fav.get('id')) != str(recipe_id)]
-        
-        if len(self.favorites) < initial_count:
-            self._save_favorites()
-            logger.info(f"Removed recipe {recipe_id} from favorites for user {self.id}")
-            return True
-        else:
+        if self._fav_index.pop(str(recipe_id), None) is None:
             logger.info(f"Recipe {recipe_id} not found in favorites for user {self.id}")
             return False
+        
+        connection = store.get_connection()
+        with store.lock:
+            connection.execute(
+                "DELETE FROM favorites WHERE user_id = ? AND recipe_id = ?",
+                (str(self.id), str(recipe_id))
+            )
+        
+        self.favorites = [fav for fav in self.favorites if str(fav.get('id')) != str(recipe_id)]
+        logger.info(f"Removed recipe {recipe_id} from favorites for user {self.id}")
+        return True
     
     def get_favorites(self, limit=None, sort_by='added_at', reverse=True):
         """
@@ -137,16 +173,22 @@ class User:
         Returns:
             list: List of favorite recipes
         """
-        # Sort favorites
-        if sort_by in self.favorites[0] if self.favorites else []:
-            sorted_favorites = sorted(self.favorites, key=lambda x: x.get(sort_by, 0), reverse=reverse)
-        else:
-            sorted_favorites = self.favorites
+        if not self.favorites:
+            return []
+        
+        has_limit = limit is not None and limit > 0
+        
+        # Keep the stored order if favorites don't have the sort field
+        if sort_by not in self.favorites[0]:
+            return self.favorites[:limit] if has_limit else self.favorites
+        
+        key = lambda x: x.get(sort_by, 0)
         
-        # Apply limit if specified
-        if limit is not None and limit > 0:
-            return sorted_favorites[:limit]
-        return sorted_favorites
+        # Only the first `limit` favorites need to be ordered
+        if has_limit:
+            pick = nlargest if reverse else nsmallest
+            return pick(limit, self.favorites, key=key)
+        return sorted(self.favorites, key=key, reverse=reverse)
     
     def is_favorite(self, recipe_id):
         """
@@ -158,7 +200,7 @@ class User:
         Returns:
             bool: True if in favorites, False otherwise
         """
-        return any(str(fav.get('id')) == str(recipe_id) for fav in self.favorites)
+        return str(recipe_id) in self._fav_index
     
     def update_preferences(self, preferences):
         """
@@ -171,6 +213,13 @@ class User:
             for key, value in preferences.items():
                 if key in self.preferences:
                     self.preferences[key] = value
+            
+            connection = store.get_connection()
+            with store.lock:
+                connection.execute(
+                    "INSERT OR REPLACE INTO preferences (user_id, payload) VALUES (?, ?)",
+                    (str(self.id), orjson.dumps(self.preferences).decode())
+                )
             logger.info(f"Updated preferences for user {self.id}")
     
     def to_dict(self):
@@ -1,16 +1,17 @@
 import os
 import re
-import json
 import time
+import heapq
 import logging
-from typing import Dict, List, Optional, Union, Any
-from datetime import datetime
+import orjson
+import msgspec
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple, Union, Any
 
-import requests
-from bs4 import BeautifulSoup
-from fastapi import FastAPI, HTTPException, Request, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import openai
@@ -18,25 +19,55 @@ import aiohttp
 import asyncio
 from recipe_instructions_service import (
     scrape_instructions, 
+    create_scrape_session,
+    create_openai_client,
+    warm_connections,
     generate_instructions_with_ai,
-    generate_basic_instructions
+    generate_basic_instructions,
+    build_instructions_prompt,
+    openai_session,
+    get_cache_key,
+    pack_cached,
+    unpack_cached,
+    trim_cache,
+    compact_expiry_heap,
+    cache_ttl,
+    is_stale,
+    single_flight,
+    CHEF_SYSTEM_PROMPT,
+    AI_MODEL,
+    AI_MAX_TOKENS
 )
+from utils.logger import setup_queue_logging
+from config.config import active_config
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
+# Logging is configured by app.py, or by the lifespan when served on its own
 logger = logging.getLogger("recipe_instructions_api")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share one HTTP session for scraping and sweep the cache while the app is running."""
+    # Runs in each worker when this API is served on its own. Log through a
+    # queue so the event loop never blocks on console writes.
+    setup_queue_logging(active_config.LOG_LEVEL, filename=None)
+    app.state.session = create_scrape_session()
+    app.state.openai = create_openai_client() if openai.api_key else None
+    sweeper = asyncio.create_task(sweep_cache())
+    warmer = asyncio.create_task(warm_connections(app.state.session))
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+        warmer.cancel()
+        await app.state.session.close()
+        if app.state.openai is not None:
+            await app.state.openai.close()
+
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -53,16 +84,24 @@ if not openai.api_key:
     logger.warning("OPENAI_API_KEY not set. AI generation will not work.")
 
 # Configuration
-CACHE_TTL = int(os.getenv("CACHE_TTL", "86400"))  # 24 hours in seconds
-SCRAPING_RATE_LIMIT = int(os.getenv("SCRAPING_RATE_LIMIT", "100"))  # requests per hour
-OPENAI_RATE_LIMIT = int(os.getenv("OPENAI_RATE_LIMIT", "20"))  # requests per minute
+# In-memory LRU cache with second chances for entries that were hit, capped at
+# MAX_CACHE_ENTRIES (see trim_cache). Entries are stamped with
+# time.monotonic(), since only their age matters.
+MAX_CACHE_ENTRIES = int(os.getenv("MAX_CACHE_ENTRIES", "10000"))
+CACHE_SWEEP_INTERVAL = int(os.getenv("CACHE_SWEEP_INTERVAL", "60"))  # seconds between expiry sweeps
+cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+# (expiry time, key) for every entry added, so sweeps only visit expired keys
+expiry_heap: List[Tuple[float, str]] = []
+
+# Responses being built, by cache key, so concurrent identical requests
+# share one scrape or AI call
+inflight: Dict[str, "asyncio.Future[RecipeInstructionsResponse]"] = {}
 
-# In-memory cache
-cache: Dict[str, Dict[str, Any]] = {}
+# Scrapes are cut off by aiohttp after this long
+SCRAPE_TIMEOUT = aiohttp.ClientTimeout(total=10)
 
-# Rate limiting
-scraping_requests = []
-openai_requests = []
+# Only http(s) source URLs are scraped
+is_http_url = re.compile(r"^https?://").match
 
 # Models
 class RecipeInstructionsRequest(BaseModel):
@@ -74,6 +113,28 @@ class RecipeInstructionsRequest(BaseModel):
     diets: Optional[List[str]] = []
     cuisine: Optional[str] = None
 
+class RecipeInstructionsPayload(msgspec.Struct):
+    """
+    Request body of the endpoint, decoded and validated by msgspec in one pass.
+    
+    Accepts what RecipeInstructionsRequest does, with numeric strings allowed
+    for servings and numeric recipe IDs turned into strings. Unlike Pydantic,
+    other fields are not coerced to strings.
+    """
+    recipe_name: str
+    ingredients: List[str]
+    recipe_id: Union[str, int, None] = "temp_id"
+    source_url: Optional[str] = None
+    servings: Optional[int] = None
+    diets: Optional[List[str]] = []
+    cuisine: Optional[str] = None
+    
+    def __post_init__(self):
+        if isinstance(self.recipe_id, int):
+            self.recipe_id = str(self.recipe_id)
+
+decode_payload = msgspec.json.Decoder(RecipeInstructionsPayload, strict=False).decode
+
 class RecipeInstructionsResponse(BaseModel):
     recipe_id: str
     instructions: str
@@ -81,47 +142,154 @@ class RecipeInstructionsResponse(BaseModel):
     cached: bool = False
 
 # Cache management
-def get_from_cache(recipe_id: str) -> Optional[Dict[str, Any]]:
+def get_from_cache(key: str) -> Optional[Dict[str, Any]]:
     """Get recipe instructions from cache if available and not expired."""
-    if recipe_id in cache:
-        entry = cache[recipe_id]
-        if time.time() - entry["timestamp"] < CACHE_TTL:
+    if key in cache:
+        entry = cache[key]
+        if time.monotonic() - entry["timestamp"] < entry["ttl"]:
+            cache.move_to_end(key)
+            entry["hits"] += 1
             return entry
         else:
             # Remove expired entry
-            del cache[recipe_id]
+            del cache[key]
     return None
 
-def add_to_cache(recipe_id: str, instructions: str, source: str) -> None:
-    """Add recipe instructions to cache."""
-    cache[recipe_id] = {
-        "instructions": instructions,
+def add_to_cache(key: str, instructions: str, source: str) -> None:
+    """
+    Add recipe instructions to cache, evicting the least recently used entries if full.
+    
+    The cached response body is encoded once here, minus the recipe_id,
+    which differs between requests that share an entry. It is the only copy
+    of the instructions kept, compressed when long enough.
+    """
+    body = orjson.dumps({"instructions": instructions, "source": source, "cached": True})
+    body_tail, compressed = pack_cached(body[1:])
+    now = time.monotonic()
+    cache[key] = {
         "source": source,
-        "timestamp": time.time(),
+        "timestamp": now,
+        "body_tail": body_tail,
+        "compressed": compressed,
+        "ttl": cache_ttl(source),
+        "hits": 0,
     }
+    cache.move_to_end(key)
+    heapq.heappush(expiry_heap, (now + cache[key]["ttl"], key))
+    trim_cache(cache, MAX_CACHE_ENTRIES)
+    compact_expiry_heap(expiry_heap, cache)
 
-# OpenAI client provider
-def get_openai_client():
-    # Get API key from environment variable
-    api_key = os.environ.get("OPENAI_API_KEY")
-    
-    if not api_key:
-        logger.warning("OPENAI_API_KEY not found in environment variables")
-        return None
-    
-    # For older OpenAI API versions (0.x.x)
-    openai.api_key = api_key
-    return None
+def cached_body_tail(entry: Dict[str, Any]) -> bytes:
+    """The entry's encoded response body, minus its opening brace."""
+    return unpack_cached(entry["body_tail"], entry["compressed"])
+
+def cached_instructions(entry: Dict[str, Any]) -> str:
+    """The instructions text of a cache entry, which is only kept in its encoded body."""
+    return orjson.loads(b"{" + cached_body_tail(entry))["instructions"]
+
+def cache_result(background_tasks: Optional[BackgroundTasks], key: str, response: RecipeInstructionsResponse) -> None:
+    """Cache a response after it is sent when running in a request, otherwise right away."""
+    if background_tasks is None:
+        add_to_cache(key, response.instructions, response.source)
+    else:
+        background_tasks.add_task(add_to_cache, key, response.instructions, response.source)
+
+def evict_expired() -> None:
+    """
+    Drop every expired entry, including ones that are never looked up again.
+
+    Heap items whose key was since re-added or evicted are discarded.
+    """
+    now = time.monotonic()
+    while expiry_heap and expiry_heap[0][0] <= now:
+        _, key = heapq.heappop(expiry_heap)
+        entry = cache.get(key)
+        if entry and entry["timestamp"] + entry["ttl"] <= now:
+            del cache[key]
+
+async def sweep_cache() -> None:
+    """Evict expired cache entries every CACHE_SWEEP_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(CACHE_SWEEP_INTERVAL)
+        evict_expired()
 
 # Main function to get recipe instructions using hybrid approach
+async def read_payload(raw_request: Request) -> RecipeInstructionsPayload:
+    """Decode and validate a request body, answering 400/422 when it is invalid."""
+    try:
+        return decode_payload(await raw_request.body())
+    except msgspec.ValidationError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.post("/api/recipe-instructions", response_model=RecipeInstructionsResponse)
-async def get_recipe_instructions(
-    request: RecipeInstructionsRequest,
+async def recipe_instructions_endpoint(
+    raw_request: Request,
     background_tasks: BackgroundTasks,
-) -> RecipeInstructionsResponse:
+):
     """Get recipe instructions from a URL or generate them with AI."""
+    request = await read_payload(raw_request)
+    
     # Log the request
-    logger.info(f"Received request for recipe instructions: {request.recipe_name}")
+    logger.info("Received request for recipe instructions: %s", request.recipe_name)
+    
+    # Serve scraped or AI-generated instructions from the cache when we have
+    # them. New results are cached by a background task after the response.
+    key = get_cache_key(request)
+    cached_data = get_from_cache(key)
+    if cached_data:
+        logger.info("Cache hit for recipe instructions: %s", request.recipe_name)
+        if is_stale(cached_data):
+            background_tasks.add_task(refresh_instructions, request, key)
+        body = b'{"recipe_id":' + orjson.dumps(request.recipe_id) + b"," + cached_body_tail(cached_data)
+        return Response(content=body, media_type="application/json")
+    
+    # Share the response of an identical request that is already being handled
+    response, joined = await single_flight(
+        inflight, key, lambda: get_recipe_instructions(request, background_tasks, key)
+    )
+    if joined:
+        logger.info("Joined in-flight request for recipe instructions: %s", request.recipe_name)
+        return response.copy(update={"recipe_id": request.recipe_id})
+    return response
+
+async def refresh_instructions(request: RecipeInstructionsPayload, key: str) -> None:
+    """
+    Rebuild a cache entry that is close to expiring, after a response has
+    served it, unless it was refreshed or is being built already.
+    """
+    entry = cache.get(key)
+    if entry is None or not is_stale(entry) or key in inflight:
+        return
+    
+    logger.info("Refreshing cached instructions for: %s", request.recipe_name)
+    try:
+        await single_flight(inflight, key, lambda: get_recipe_instructions(request, None, key))
+    except Exception as e:
+        logger.warning("Error refreshing cached instructions: %s", e)
+
+async def get_recipe_instructions(
+    request: Union[RecipeInstructionsRequest, RecipeInstructionsPayload],
+    background_tasks: Optional[BackgroundTasks] = None,
+    key: Optional[str] = None,
+) -> RecipeInstructionsResponse:
+    """
+    Get recipe instructions from a URL or generate them with AI.
+    
+    Without background_tasks (callers outside a FastAPI request), the cache
+    is checked and written directly.
+    """
+    if key is None:
+        key = get_cache_key(request)
+        cached_data = get_from_cache(key)
+        if cached_data:
+            return RecipeInstructionsResponse(
+                recipe_id=request.recipe_id,
+                instructions=cached_instructions(cached_data),
+                source=cached_data["source"],
+                cached=True
+            )
     
     # Initialize response
     api_response = RecipeInstructionsResponse(
@@ -135,30 +303,30 @@ async def get_recipe_instructions(
     
     try:
         # If URL is provided and valid, try to scrape instructions first
-        if request.source_url and request.source_url.startswith(("http://", "https://")):
+        if request.source_url and is_http_url(request.source_url) is not None:
             try:
-                # Use an increased timeout of 10 seconds for scraping
-                logger.info(f"Attempting to scrape instructions from: {request.source_url}")
-                instructions, scrape_result_type = await asyncio.wait_for(
-                    scrape_instructions(request.source_url), 
-                    timeout=10.0
+                # Use an increased timeout of 10 seconds for scraping. The shared
+                # session only exists while the app's lifespan is running.
+                logger.info("Attempting to scrape instructions from: %s", request.source_url)
+                instructions, scrape_result_type = await scrape_instructions(
+                    request.source_url,
+                    getattr(app.state, "session", None),
+                    timeout=SCRAPE_TIMEOUT
                 )
                 
                 if instructions and scrape_result_type == "success":
-                    logger.info(f"Successfully scraped instructions for: {request.recipe_name}")
+                    logger.info("Successfully scraped instructions for: %s", request.recipe_name)
                     api_response.instructions = instructions
                     api_response.source = "scraped"
+                    cache_result(background_tasks, key, api_response)
                     return api_response
                 else:
-                    logger.warning(f"Scraping failed with result type: {scrape_result_type}. Falling back to AI generation")
-            except asyncio.TimeoutError:
-                logger.warning(f"Scraping timed out after 10 seconds for URL: {request.source_url}")
-                scrape_result_type = "timeout"
+                    logger.warning("Scraping failed with result type: %s. Falling back to AI generation", scrape_result_type)
             except Exception as e:
-                logger.warning(f"Error scraping instructions: {str(e)}")
+                logger.warning("Error scraping instructions: %s", e)
                 scrape_result_type = "error"
         elif request.source_url:
-            logger.warning(f"Invalid URL provided: {request.source_url}")
+            logger.warning("Invalid URL provided: %s", request.source_url)
             scrape_result_type = "invalid_url"
         else:
             logger.info("No URL provided, skipping scraping step")
@@ -166,7 +334,7 @@ async def get_recipe_instructions(
         
         # If we get here, either no URL was provided, or scraping failed, or the timeout occurred
         # Try to generate instructions with AI as a fallback
-        logger.info(f"Generating instructions with AI for: {request.recipe_name}")
+        logger.info("Generating instructions with AI for: %s", request.recipe_name)
         
         # Check if OpenAI API key is available
         if not openai.api_key:
@@ -178,14 +346,15 @@ async def get_recipe_instructions(
         try:
             # Use a higher timeout for AI generation (25 seconds)
             instructions = await asyncio.wait_for(
-                generate_instructions_with_ai(request), 
+                generate_instructions_with_ai(request, getattr(app.state, "openai", None)), 
                 timeout=25.0
             )
             
             if instructions:
-                logger.info(f"Successfully generated AI instructions for: {request.recipe_name}")
+                logger.info("Successfully generated AI instructions for: %s", request.recipe_name)
                 api_response.instructions = instructions
                 api_response.source = "ai-generated"
+                cache_result(background_tasks, key, api_response)
                 return api_response
             else:
                 logger.warning("AI generated empty instructions")
@@ -201,7 +370,7 @@ async def get_recipe_instructions(
             api_response.source = "basic"
             return api_response
         except Exception as e:
-            logger.error(f"Error generating instructions with AI: {str(e)}")
+            logger.error("Error generating instructions with AI: %s", e)
             # If AI generation fails, use basic fallback
             api_response.instructions = generate_basic_instructions(request)
             api_response.source = "basic"
@@ -209,19 +378,78 @@ async def get_recipe_instructions(
             
     except Exception as e:
         # This is the final fallback to ensure the API always returns a response
-        logger.error(f"Unhandled error in get_recipe_instructions: {str(e)}")
+        logger.error("Unhandled error in get_recipe_instructions: %s", e)
         try:
             # Try to generate basic instructions as a last resort
             api_response.instructions = generate_basic_instructions(request)
             api_response.source = "basic"
         except Exception as inner_e:
             # If even that fails, return a simple message
-            logger.error(f"Failed to generate basic instructions: {str(inner_e)}")
+            logger.error("Failed to generate basic instructions: %s", inner_e)
             api_response.instructions = f"1. Gather all ingredients for {request.recipe_name}.\n2. Prepare and cook according to standard practices for this type of dish.\n3. Serve and enjoy!"
             api_response.source = "basic"
         
         return api_response 
 
+@app.post("/api/recipe-instructions/stream")
+async def stream_recipe_instructions(
+    raw_request: Request,
+    background_tasks: BackgroundTasks,
+):
+    """
+    Stream AI-generated instructions as plain text while OpenAI produces them.
+    
+    Cached instructions are sent whole. Without an OpenAI client, or if
+    generation fails before any text arrives, the basic instructions are
+    sent instead. A completed stream is cached once it has been sent.
+    """
+    request = await read_payload(raw_request)
+    logger.info("Received streaming request for recipe instructions: %s", request.recipe_name)
+    
+    # Streamed text skips scraping and numbering, so it is cached apart from
+    # the POST endpoint's entries, which it can still serve
+    key = get_cache_key(request)
+    stream_key = "stream:" + key
+    cached_data = get_from_cache(key) or get_from_cache(stream_key)
+    if cached_data:
+        return Response(content=cached_instructions(cached_data), media_type="text/plain")
+    
+    client = getattr(app.state, "openai", None)
+    if client is None:
+        return Response(content=generate_basic_instructions(request), media_type="text/plain")
+    
+    async def generate():
+        parts = []
+        prompt = build_instructions_prompt(request)
+        try:
+            async with openai_session(client, prompt) as session_client:
+                stream = await session_client.chat.completions.create(
+                    model=AI_MODEL,
+                    messages=[
+                        {"role": "system", "content": CHEF_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=AI_MAX_TOKENS,
+                    stream=True
+                )
+                async for chunk in stream:
+                    text = chunk.choices[0].delta.content if chunk.choices else None
+                    if text:
+                        parts.append(text)
+                        yield text
+        except Exception as e:
+            logger.error("Error streaming instructions with AI: %s", e)
+            if not parts:
+                yield generate_basic_instructions(request)
+            return
+        
+        if parts:
+            background_tasks.add_task(add_to_cache, stream_key, "".join(parts).strip(), "ai-generated")
+    
+    # FastAPI runs the background tasks after the last chunk has been sent
+    return StreamingResponse(generate(), media_type="text/plain")
+
 # Health endpoint
 @app.get("/api/health")
 async def health_check():
@@ -237,7 +465,16 @@ if __name__ == "__main__":
     parser.add_argument("--port", type=int, default=8003, help="Port to run the server on")
     args = parser.parse_args()
     
-    # Use the port from command line or default to 8003
+    # Use the port from command line or default to 8003. Each worker keeps its
+    # own cache; uvicorn picks up uvloop and httptools when they are installed.
     port = args.port
-    logger.info(f"Starting recipe instructions API on port {port}")
-    uvicorn.run(app, host="0.0.0.0", port=port) 
\ No newline at end of file
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    logger.info("Starting recipe instructions API on port %s", port)
+    uvicorn.run(
+        "recipe_instructions_api:app",
+        host="0.0.0.0",
+        port=port,
+        loop="auto",
+        http="auto",
+        workers=workers
+    ) 
\ No newline at end of file
@@ -1,35 +1,136 @@
 import os
 import re
-import json
 import time
+import heapq
 import logging
+import orjson
 import asyncio
-from typing import Dict, List, Optional, Union, Any
-from datetime import datetime
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Any
 
-import requests
-from bs4 import BeautifulSoup
-from fastapi import FastAPI, HTTPException, Request, Depends
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import openai
 import aiohttp
 import hashlib
+import soupsieve
+try:
+    import zstandard
+except ImportError:
+    # Cache entries are then kept uncompressed
+    zstandard = None
+from config.config import active_config
+from utils.orjson_route import ORJSONRoute
 
 # Load environment variables
 load_dotenv()
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=active_config.LOG_LEVEL,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger("recipe-instructions-service")
 
+# Prefer the C-based lxml parser, falling back to the pure-Python one where libxml2 is missing
+try:
+    BeautifulSoup("", "lxml")
+    PARSER = "lxml"
+except FeatureNotFound:
+    PARSER = "html.parser"
+
+# Only a page's JSON-LD scripts are parsed for the structured data pass. The
+# HTML selectors depend on ancestors of any tag, so that pass parses it all.
+STRAINER_JSONLD = SoupStrainer("script", attrs={"type": "application/ld+json"})
+
+# Step numbering, stripped from scraped and generated steps before they are renumbered
+STEP_NUMBER_RE = re.compile(r'^\d+[\.\)]\s*')
+NUMBER_PREFIX_RE = re.compile(r'^\d+\.\s*')
+NUMBERED_STEP_RE = re.compile(r'^\d+\.')
+BLANK_LINE_RE = re.compile(r'\n\s*\n')
+
+# Generic instruction step selectors, in priority order. One find_all pass
+# over the page collects every element whose own tag or class could match,
+# and only those candidates are matched against each selector.
+GENERIC_STEP_SELECTORS = (
+    ".recipe-directions__list--item",  # AllRecipes
+    ".instructions-section .section-body",  # Epicurious
+    ".preparation-steps li",  # BBC Good Food
+    ".recipe-method-list li",  # Various sites
+    ".recipe-instructions li",  # Various sites
+    ".recipe__instructions li",  # Several recipe sites
+    ".instruction-item",  # Some cooking sites
+    ".step",  # Step-based instructions
+    ".recipe-steps li",  # Various sites
+    ".recipe__list--steps li",  # Some food blogs
+    ".recipe-instructions ol li",  # Generic
+    ".directions ol li",  # Generic
+    ".method ol li",  # Generic
+    ".instructions ol li",  # Generic
+    "[itemprop='recipeInstructions'] li",  # Schema.org
+    ".recipe-procedure-text",  # NYT Cooking
+)
+
+# AllRecipes step selectors, newest page structure first
+ALLRECIPES_STEP_SELECTORS = (
+    ".mntl-sc-block-group--LI",  # Current AllRecipes structure
+    ".directions-container .directions__container ol li",  # Previous structure
+    ".recipe-directions__list--item",  # Older structure
+    "[data-testid='recipe-instructions'] li",  # Alternative structure
+)
+# Ads and media prompts that AllRecipes mixes into its step lists
+NOT_STEPS = frozenset(("advertisement", "watch now", "see how it's made"))
+
+# Step selectors of sites whose markup is known, tried before the generic pass
+HOST_STEP_SELECTORS = {
+    "epicurious.com": (".instructions-section .section-body",),
+    "bbcgoodfood.com": (".preparation-steps li", ".recipe-method-list li"),
+    "cooking.nytimes.com": (".recipe-procedure-text",),
+}
+
+GENERIC_STEP_PATTERNS = tuple((selector, soupsieve.compile(selector)) for selector in GENERIC_STEP_SELECTORS)
+STEP_TAGS = {selector.split()[-1] for selector in GENERIC_STEP_SELECTORS if selector.split()[-1].isalpha()}
+STEP_CLASSES = {selector.split()[-1][1:] for selector in GENERIC_STEP_SELECTORS if selector.split()[-1].startswith(".")}
+
+
+def is_step_candidate(tag) -> bool:
+    """Whether the tag's own name or classes match the last part of a generic step selector."""
+    return tag.name in STEP_TAGS or not STEP_CLASSES.isdisjoint(tag.get("class", ()))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share one HTTP session for scraping and sweep the cache while the app is running."""
+    app.state.session = create_scrape_session()
+    app.state.openai = create_openai_client() if openai.api_key else None
+    sweeper = asyncio.create_task(sweep_cache())
+    warmer = asyncio.create_task(warm_connections(app.state.session))
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+        warmer.cancel()
+        await app.state.session.close()
+        if app.state.openai is not None:
+            await app.state.openai.close()
+
+
 # Initialize FastAPI app
-app = FastAPI(title="Recipe Instructions Service")
+app = FastAPI(
+    title="Recipe Instructions Service",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+# Parse request bodies with orjson
+app.router.route_class = ORJSONRoute
 
 # Add CORS middleware
 app.add_middleware(
@@ -49,15 +150,132 @@ if not openai.api_key:
 PORT = int(os.getenv("PORT", "8000"))
 HOST = os.getenv("HOST", "0.0.0.0")
 CACHE_TTL = int(os.getenv("CACHE_TTL", "86400"))  # 24 hours in seconds
-SCRAPING_RATE_LIMIT = int(os.getenv("SCRAPING_RATE_LIMIT", "100"))  # requests per hour
-OPENAI_RATE_LIMIT = int(os.getenv("OPENAI_RATE_LIMIT", "20"))  # requests per minute
+SCRAPED_CACHE_TTL = int(os.getenv("SCRAPED_CACHE_TTL", "2592000"))  # 30 days; published recipes rarely change
+REFRESH_AFTER = 0.8  # share of an entry's TTL after which a hit also rebuilds it
+SCRAPING_RATE_LIMIT = int(os.getenv("SCRAPING_RATE_LIMIT", "100"))  # requests per hour, 0 for no limit
+OPENAI_RATE_LIMIT = int(os.getenv("OPENAI_RATE_LIMIT", "20"))  # concurrent OpenAI requests
+OPENAI_RPM = int(os.getenv("OPENAI_RPM", "500"))  # OpenAI requests per minute, 0 for no limit
+OPENAI_TPM = int(os.getenv("OPENAI_TPM", "60000"))  # OpenAI tokens per minute, 0 for no limit
+OPENAI_BACKOFF = 30.0  # seconds OpenAI requests are slowed down for after a 429
+AI_TIMEOUT = 25.0  # seconds allowed for each OpenAI request
+AI_MODEL = "gpt-3.5-turbo"  # chat model instructions are generated with
+AI_MAX_TOKENS = 1000  # completion tokens allowed for a recipe's instructions
+
+# In-memory LRU cache with second chances for entries that were hit, capped at
+# MAX_CACHE_ENTRIES (see trim_cache). Entries are stamped with
+# time.monotonic(), since only their age matters.
+MAX_CACHE_ENTRIES = int(os.getenv("MAX_CACHE_ENTRIES", "10000"))
+CACHE_SWEEP_INTERVAL = int(os.getenv("CACHE_SWEEP_INTERVAL", "60"))  # seconds between expiry sweeps
+cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+# (expiry time, key) for every entry added, so sweeps only visit expired keys
+expiry_heap: List[Tuple[float, str]] = []
+# Cached text of at least COMPRESS_MIN_BYTES is kept zstd-compressed;
+# below that the frame overhead outweighs the saving
+COMPRESS_MIN_BYTES = 200
+
 
-# In-memory cache
-cache: Dict[str, Dict[str, Any]] = {}
+@dataclass
+class TokenBucket:
+    """
+    Allows bursts of up to `capacity` requests, refilled at `rate` requests per
+    second. A rate of 0 or less means no limit.
+    """
+    capacity: float
+    rate: float
+    tokens: float = field(init=False)
+    last_refill: float = field(default_factory=time.monotonic)
+    slow_until: float = field(default=0.0, init=False)
+
+    def __post_init__(self):
+        self.tokens = self.capacity
+
+    def refill_rate(self) -> float:
+        """The current refill rate, halved while backing off."""
+        return self.rate / 2 if time.monotonic() < self.slow_until else self.rate
+
+    def take(self, amount: float = 1) -> bool:
+        """Spend `amount` tokens if they are available. Never awaits, so callers need no lock."""
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate())
+        self.last_refill = now
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until `amount` tokens (at most `capacity`) are available, then spend them."""
+        amount = min(amount, self.capacity)
+        while not self.take(amount):
+            await asyncio.sleep((amount - self.tokens) / self.refill_rate())
+
+    def back_off(self, period: float) -> None:
+        """Halve the refill rate for `period` seconds, after an upstream rate limit was hit."""
+        self.slow_until = time.monotonic() + period
+
+
+# Rate limiting: SCRAPING_RATE_LIMIT requests per hour
+scraping_bucket = TokenBucket(capacity=SCRAPING_RATE_LIMIT, rate=SCRAPING_RATE_LIMIT / 3600)
 
-# Rate limiting
-scraping_requests = []
-openai_requests = []
+# OpenAI requests wait for room under the account's per-minute request and
+# token limits, rather than being sent and retried after a 429
+openai_requests = TokenBucket(capacity=OPENAI_RPM, rate=OPENAI_RPM / 60)
+openai_tokens = TokenBucket(capacity=OPENAI_TPM, rate=OPENAI_TPM / 60)
+
+# Responses being built, by cache key, so concurrent identical requests
+# share one scrape or AI call
+inflight: Dict[str, "asyncio.Future[RecipeInstructionsResponse]"] = {}
+
+# AI generations being awaited, by prompt, so requests that differ only in
+# their URL (e.g. after failed scrapes) share one OpenAI call
+generating: Dict[str, "asyncio.Future[str]"] = {}
+
+
+class FlightCancelled(RuntimeError):
+    """Set on a shared future when the caller doing the work was cancelled."""
+
+
+async def single_flight(flights: Dict[str, asyncio.Future], key: str, work: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+    """
+    Await work() once for concurrent callers with the same key.
+    
+    Returns its result and whether it was shared by another caller. Errors
+    are shared too, except cancellation: if the caller doing the work is
+    cancelled, the others start over instead of being cancelled with it.
+    """
+    while key in flights:
+        try:
+            return await asyncio.shield(flights[key]), True
+        except FlightCancelled:
+            continue
+    
+    future = asyncio.get_running_loop().create_future()
+    flights[key] = future
+    try:
+        result = await work()
+    except asyncio.CancelledError:
+        future.set_exception(FlightCancelled(key))
+        future.exception()  # waiters start over; don't log it as unretrieved
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # waiters re-raise it; don't also log it as unretrieved
+        raise
+    else:
+        future.set_result(result)
+        return result, False
+    finally:
+        flights.pop(key, None)
+
+# Threads scraped pages are parsed on, bounded so parsing cannot take them all
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "4"))
+parse_executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+
+# Caps concurrent requests on the shared OpenAI client; created on first use
+# so it belongs to the app's event loop
+openai_limit: Optional[asyncio.Semaphore] = None
 
 
 # Models
@@ -84,58 +302,222 @@ async def rate_limit_middleware(request: Request, call_next):
     path = request.url.path
     
     # Only apply rate limiting to specific endpoints
-    if path == "/api/recipe-instructions":
-        # Clean up old requests
-        current_time = time.time()
-        global scraping_requests, openai_requests
-        scraping_requests = [t for t in scraping_requests if current_time - t < 3600]  # 1 hour
-        openai_requests = [t for t in openai_requests if current_time - t < 60]  # 1 minute
-        
-        # Check rate limits
-        if len(scraping_requests) >= SCRAPING_RATE_LIMIT:
-            return JSONResponse(
-                status_code=429,
-                content={"detail": "Rate limit exceeded for scraping. Try again later."},
-            )
-        
-        if len(openai_requests) >= OPENAI_RATE_LIMIT:
-            return JSONResponse(
-                status_code=429,
-                content={"detail": "Rate limit exceeded for AI generation. Try again later."},
-            )
-        
-        # Add current request timestamp
-        scraping_requests.append(current_time)
-        openai_requests.append(current_time)
+    if path == "/api/recipe-instructions" and not scraping_bucket.take():
+        return ORJSONResponse(
+            status_code=429,
+            content={"detail": "Rate limit exceeded for scraping. Try again later."},
+        )
     
     response = await call_next(request)
     return response
 
 
 # Cache management
-def get_from_cache(recipe_id: str) -> Optional[Dict[str, Any]]:
+def get_cache_key(recipe_data) -> str:
+    """
+    Content-address an instructions request, so identical requests share an
+    entry whatever recipe_id they carry and whatever order their ingredients
+    are listed in. Every value is length-prefixed, so no two requests hash
+    the same input.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    
+    def add(value: Any) -> None:
+        data = b"" if value is None else str(value).encode()
+        h.update(len(data).to_bytes(8, "big"))
+        h.update(data)
+    
+    ingredients = sorted(recipe_data.ingredients)
+    diets = recipe_data.diets or []
+    add(recipe_data.recipe_name)
+    add(recipe_data.source_url)
+    add(len(ingredients))
+    for ingredient in ingredients:
+        add(ingredient)
+    add(recipe_data.servings)
+    add(recipe_data.cuisine)
+    add(len(diets))
+    for diet in diets:
+        add(diet)
+    return h.hexdigest()
+
+
+def pack_cached(data: bytes) -> Tuple[bytes, bool]:
+    """Compress data for the cache when it is long enough to be worth it. Returns (data, compressed)."""
+    if zstandard is None or len(data) < COMPRESS_MIN_BYTES:
+        return data, False
+    return zstandard.compress(data, 3), True
+
+
+def unpack_cached(data: bytes, compressed: bool) -> bytes:
+    """Reverse pack_cached."""
+    return zstandard.decompress(data) if compressed else data
+
+
+def cache_ttl(source: str) -> int:
+    """How long instructions from a source are cached."""
+    return SCRAPED_CACHE_TTL if source == "scraped" else CACHE_TTL
+
+
+def is_stale(entry: Dict[str, Any]) -> bool:
+    """Whether a cache entry is close enough to expiring that it should be rebuilt."""
+    return time.monotonic() - entry["timestamp"] > REFRESH_AFTER * entry["ttl"]
+
+
+def get_from_cache(key: str) -> Optional[Dict[str, Any]]:
     """Get recipe instructions from cache if available and not expired."""
-    if recipe_id in cache:
-        entry = cache[recipe_id]
-        if time.time() - entry["timestamp"] < CACHE_TTL:
-            return entry
+    if key in cache:
+        entry = cache[key]
+        if time.monotonic() - entry["timestamp"] < entry["ttl"]:
+            cache.move_to_end(key)
+            entry["hits"] += 1
+            instructions = unpack_cached(entry["instructions"], entry["compressed"])
+            return {**entry, "instructions": instructions.decode("utf-8")}
         else:
             # Remove expired entry
-            del cache[recipe_id]
+            del cache[key]
     return None
 
 
-def add_to_cache(recipe_id: str, instructions: str, source: str) -> None:
-    """Add recipe instructions to cache."""
-    cache[recipe_id] = {
-        "instructions": instructions,
+def add_to_cache(key: str, instructions: str, source: str) -> None:
+    """Add recipe instructions to cache, evicting the least recently used entries if full."""
+    now = time.monotonic()
+    data, compressed = pack_cached(instructions.encode("utf-8"))
+    cache[key] = {
+        "instructions": data,
+        "compressed": compressed,
         "source": source,
-        "timestamp": time.time(),
+        "timestamp": now,
+        "ttl": cache_ttl(source),
+        "hits": 0,
     }
+    cache.move_to_end(key)
+    heapq.heappush(expiry_heap, (now + cache[key]["ttl"], key))
+    trim_cache(cache, MAX_CACHE_ENTRIES)
+    compact_expiry_heap(expiry_heap, cache)
+
+
+def trim_cache(cache: "OrderedDict[str, Dict[str, Any]]", limit: int) -> None:
+    """
+    Evict least recently used entries until at most `limit` remain.
+
+    An entry that has been hit since it was last considered gets a second
+    chance instead, so a burst of one-off requests cannot flush the
+    recipes that are asked for again and again.
+    """
+    while len(cache) > limit:
+        key, entry = cache.popitem(last=False)
+        if entry["hits"]:
+            entry["hits"] = 0
+            cache[key] = entry
+
+
+def compact_expiry_heap(heap: List[Tuple[float, str]], cache: "OrderedDict[str, Dict[str, Any]]") -> None:
+    """
+    Rebuild an expiry heap from the cache once it holds more than twice as
+    many items as the cache has entries. Items for keys that were evicted
+    or re-added otherwise stay until they expire, which can take days.
+    """
+    if len(heap) > 2 * len(cache):
+        heap[:] = [(entry["timestamp"] + entry["ttl"], key) for key, entry in cache.items()]
+        heapq.heapify(heap)
+
+
+def evict_expired() -> None:
+    """
+    Drop every expired entry, including ones that are never looked up again.
+
+    Heap items whose key was since re-added or evicted are discarded.
+    """
+    now = time.monotonic()
+    while expiry_heap and expiry_heap[0][0] <= now:
+        _, key = heapq.heappop(expiry_heap)
+        entry = cache.get(key)
+        if entry and entry["timestamp"] + entry["ttl"] <= now:
+            del cache[key]
+
+
+async def sweep_cache() -> None:
+    """Evict expired cache entries every CACHE_SWEEP_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(CACHE_SWEEP_INTERVAL)
+        evict_expired()
 
 
 # Web scraping functions
-async def scrape_instructions(url: str) -> tuple[str, str]:
+# Use both connect and read timeouts to ensure responsive scraping
+SCRAPE_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+
+SCRAPE_CHUNK_SIZE = 16384  # bytes read at a time while streaming a page
+
+# Browser-like headers to avoid being blocked
+SCRAPE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Referer": "https://www.google.com/",
+    "DNT": "1",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1"
+}
+
+
+@asynccontextmanager
+async def scrape_session(session: Optional[aiohttp.ClientSession]):
+    """Yield the given session, or a short-lived one for callers outside the app."""
+    if session is not None:
+        yield session
+        return
+    async with aiohttp.ClientSession(timeout=SCRAPE_TIMEOUT, cookie_jar=aiohttp.DummyCookieJar()) as own_session:
+        yield own_session
+
+
+# Hosts most recipes are scraped from, connected to when the app starts
+WARM_HOSTS = (
+    "https://www.allrecipes.com/",
+    "https://www.epicurious.com/",
+    "https://www.bbcgoodfood.com/",
+)
+
+
+def create_scrape_session() -> aiohttp.ClientSession:
+    """
+    Create the pooled session an app scrapes through while it is running.
+
+    Idle connections are kept for 75 seconds so scrapes a minute apart
+    reuse them instead of repeating the TCP and TLS handshakes. Cookies are
+    dropped, so one scrape's cookies are never sent with the next.
+    """
+    return aiohttp.ClientSession(
+        cookie_jar=aiohttp.DummyCookieJar(),
+        connector=aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=10,
+            ttl_dns_cache=600,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        ),
+        timeout=SCRAPE_TIMEOUT
+    )
+
+
+async def warm_connections(session: aiohttp.ClientSession) -> None:
+    """Open pooled connections to WARM_HOSTS so the first scrape of each skips the handshake."""
+    async def warm(url: str) -> None:
+        try:
+            async with session.head(url, headers=SCRAPE_HEADERS, allow_redirects=True):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.info(f"Could not warm a connection to {url}: {str(e)}")
+
+    await asyncio.gather(*map(warm, WARM_HOSTS))
+
+
+async def scrape_instructions(
+    url: str,
+    session: Optional[aiohttp.ClientSession] = None,
+    timeout: aiohttp.ClientTimeout = SCRAPE_TIMEOUT,
+) -> tuple[str, str]:
     """
     Scrape recipe instructions from a URL.
     Returns a tuple of (instructions, result_type) where result_type is one of:
@@ -144,117 +526,38 @@ async def scrape_instructions(url: str) -> tuple[str, str]:
     - "connection_error": Could not connect to the website
     - "parsing_error": Connected but failed to parse content
     - "not_found": Connected but could not find instructions
+    
+    Pass the app's shared session to reuse its pooled connections. The
+    timeout is applied by aiohttp to the request itself.
     """
     logger.info(f"=== SCRAPE DEBUG === Attempting to scrape instructions from {url}")
     
     try:
-        # Set various timeouts and configure headers to avoid blocking
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Referer": "https://www.google.com/",
-            "DNT": "1",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1"
-        }
-        
-        # Use both connect and read timeouts to ensure responsive scraping
-        timeout = aiohttp.ClientTimeout(total=15, connect=5)  # Increased timeouts
-        
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with scrape_session(session) as session:
                 logger.info(f"=== SCRAPE DEBUG === Sending HTTP request to {url}")
-                async with session.get(url, headers=headers, allow_redirects=True) as response:
+                async with session.get(url, headers=SCRAPE_HEADERS, allow_redirects=True, timeout=timeout) as response:
                     logger.info(f"=== SCRAPE DEBUG === Received response from {url} with status code {response.status}")
                     
                     if response.status != 200:
                         logger.warning(f"=== SCRAPE DEBUG === Failed to retrieve page: HTTP {response.status}")
                         return "", "connection_error"
                     
-                    # Read the HTML content
-                    html_content = await response.text()
+                    # Read the HTML, stopping early if a JSON-LD block holds the instructions
+                    html_content, instructions = await read_page(response)
+                    if instructions:
+                        logger.info(f"=== SCRAPE DEBUG === Found instructions in JSON-LD before the end of the page ({len(instructions)} chars)")
+                        return instructions, "success"
                     logger.info(f"=== SCRAPE DEBUG === Retrieved HTML content ({len(html_content)} bytes)")
                     
                     if not html_content or len(html_content) < 100:
                         logger.warning("=== SCRAPE DEBUG === Retrieved empty or very small HTML content")
                         return "", "parsing_error"
                     
-                    # Try to extract the recipe instructions
-                    # First, try to extract using the specialized AllRecipes function if it's an AllRecipes URL
-                    if "allrecipes.com" in url:
-                        logger.info(f"=== SCRAPE DEBUG === URL is from AllRecipes, using specialized extractor")
-                        try:
-                            soup = BeautifulSoup(html_content, "html.parser")
-                            instructions = extract_allrecipes_instructions(soup, html_content)
-                            if instructions:
-                                logger.info(f"=== SCRAPE DEBUG === Successfully extracted AllRecipes instructions ({len(instructions)} chars)")
-                                return instructions, "success"
-                            else:
-                                logger.warning(f"=== SCRAPE DEBUG === Failed to extract AllRecipes instructions")
-                        except Exception as e:
-                            logger.error(f"=== SCRAPE DEBUG === Error extracting AllRecipes instructions: {str(e)}")
-                    
-                    # If we get here, either it's not an AllRecipes URL or the AllRecipes extractor failed
-                    # Try to extract structured data (JSON-LD)
-                    try:
-                        logger.info("=== SCRAPE DEBUG === Attempting to extract instructions from structured data")
-                        soup = BeautifulSoup(html_content, "html.parser")
-                        instructions = extract_structured_data_instructions(soup)
-                        if instructions:
-                            logger.info(f"=== SCRAPE DEBUG === Successfully extracted instructions from structured data ({len(instructions)} chars)")
-                            return instructions, "success"
-                        else:
-                            logger.warning("=== SCRAPE DEBUG === No instructions found in structured data")
-                    except Exception as e:
-                        logger.warning(f"=== SCRAPE DEBUG === Failed to extract structured data: {str(e)}")
-                    
-                    # Try generic selectors
-                    logger.info("=== SCRAPE DEBUG === Attempting generic CSS selectors")
-                    if not soup:
-                        soup = BeautifulSoup(html_content, "html.parser")
-                    
-                    selectors = [
-                        ".recipe-directions__list--item",  # AllRecipes
-                        ".instructions-section .section-body",  # Epicurious
-                        ".preparation-steps li",  # BBC Good Food
-                        ".recipe-method-list li",  # Various sites
-                        ".recipe-instructions li",  # Various sites
-                        ".recipe__instructions li",  # Several recipe sites
-                        ".instruction-item",  # Some cooking sites
-                        ".step",  # Step-based instructions
-                        ".recipe-steps li",  # Various sites
-                        ".recipe__list--steps li",  # Some food blogs
-                        ".recipe-instructions ol li",  # Generic
-                        ".directions ol li",  # Generic
-                        ".method ol li",  # Generic
-                        ".instructions ol li",  # Generic
-                        "[itemprop='recipeInstructions'] li",  # Schema.org
-                        ".recipe-procedure-text",  # NYT Cooking
-                    ]
-                    
-                    for selector in selectors:
-                        try:
-                            logger.info(f"=== SCRAPE DEBUG === Trying selector: {selector}")
-                            elements = soup.select(selector)
-                            if elements:
-                                steps = [el.get_text().strip() for el in elements if el.get_text().strip()]
-                                if steps:
-                                    logger.info(f"=== SCRAPE DEBUG === Found {len(steps)} steps with selector '{selector}'")
-                                    # Format steps nicely
-                                    instructions_text = "\n\n".join([f"{i+1}. {step}" for i, step in enumerate(steps)])
-                                    if len(instructions_text) > 50:  # Reasonable minimum length
-                                        return instructions_text, "success"
-                                else:
-                                    logger.info(f"=== SCRAPE DEBUG === Selector '{selector}' found elements but no text content")
-                            else:
-                                logger.info(f"=== SCRAPE DEBUG === Selector '{selector}' found no elements")
-                        except Exception as e:
-                            logger.warning(f"=== SCRAPE DEBUG === Error with selector '{selector}': {str(e)}")
-                    
-                    # If we get here, we failed to extract instructions using all methods
-                    logger.warning("=== SCRAPE DEBUG === Failed to extract instructions using all methods")
-                    return "", "not_found"
+                    # Parse and extract in the worker pool so the event loop keeps serving requests
+                    return await asyncio.get_running_loop().run_in_executor(
+                        parse_executor, extract_from_html, html_content, url, False
+                    )
         except asyncio.TimeoutError:
             logger.warning(f"=== SCRAPE DEBUG === Request to {url} timed out")
             return "", "timeout"
@@ -268,40 +571,179 @@ async def scrape_instructions(url: str) -> tuple[str, str]:
         return "", "error"
 
 
+async def read_page(response: aiohttp.ClientResponse) -> Tuple[str, Optional[str]]:
+    """
+    Stream a scraped page, trying each JSON-LD block as soon as it has arrived.
+
+    Returns:
+        The HTML and None, or "" and the instructions if a JSON-LD block held
+        them, in which case the rest of the page is not downloaded
+    """
+    encoding = response.charset or "utf-8"
+    buf = bytearray()
+    scan_from = 0
+    
+    async for chunk in response.content.iter_chunked(SCRAPE_CHUNK_SIZE):
+        buf.extend(chunk)
+        
+        while True:
+            start = buf.find(b"application/ld+json", scan_from)
+            if start < 0:
+                break
+            gt = buf.find(b">", start)
+            if gt < 0:
+                break
+            end = buf.find(b"</script>", gt)
+            if end < 0:
+                break
+            scan_from = end
+            instructions = instructions_from_ld_json(buf[gt + 1:end].decode(encoding, errors="replace"))
+            if instructions:
+                return "", instructions
+    
+    return buf.decode(encoding, errors="replace"), None
+
+
+def extract_from_html(html_content: str, url: str, json_ld: bool = True) -> Tuple[str, str]:
+    """
+    Extract recipe instructions from a scraped page.
+
+    Returns (instructions, "success") or ("", "not_found"), like
+    scrape_instructions. Parsing is CPU-bound, so scrape_instructions runs
+    this in parse_executor. It passes json_ld=False, since read_page has
+    already tried the page's JSON-LD.
+    """
+    # Try to extract structured data (JSON-LD) first
+    if json_ld:
+        try:
+            logger.info("=== SCRAPE DEBUG === Attempting to extract instructions from structured data")
+            soup = BeautifulSoup(html_content, PARSER, parse_only=STRAINER_JSONLD)
+            instructions = extract_structured_data_instructions(soup)
+            if instructions:
+                logger.info(f"=== SCRAPE DEBUG === Successfully extracted instructions from structured data ({len(instructions)} chars)")
+                return instructions, "success"
+            else:
+                logger.warning("=== SCRAPE DEBUG === No instructions found in structured data")
+        except Exception as e:
+            logger.warning(f"=== SCRAPE DEBUG === Failed to extract structured data: {str(e)}")
+
+    # Parse the page for the remaining extractors
+    soup = BeautifulSoup(html_content, PARSER)
+
+    # Use the site's specialized extractor if it has one
+    host = url_host(url)
+    extractor = EXTRACTORS.get(host)
+    if extractor:
+        logger.info(f"=== SCRAPE DEBUG === URL is from {host}, using specialized extractor")
+        try:
+            instructions = extractor(soup, html_content)
+            if instructions:
+                logger.info(f"=== SCRAPE DEBUG === Successfully extracted {host} instructions ({len(instructions)} chars)")
+                return instructions, "success"
+            else:
+                logger.warning(f"=== SCRAPE DEBUG === Failed to extract {host} instructions")
+        except Exception as e:
+            logger.error(f"=== SCRAPE DEBUG === Error extracting {host} instructions: {str(e)}")
+
+    # Try the selectors known for this site
+    for selector in HOST_STEP_SELECTORS.get(host, ()):
+        logger.info(f"=== SCRAPE DEBUG === Trying site selector: {selector}")
+        instructions = format_steps(soup.select(selector))
+        if instructions:
+            return instructions, "success"
+
+    # Try generic selectors
+    logger.info("=== SCRAPE DEBUG === Attempting generic CSS selectors")
+
+    candidates = soup.find_all(is_step_candidate)
+    for selector, pattern in GENERIC_STEP_PATTERNS:
+        try:
+            logger.info(f"=== SCRAPE DEBUG === Trying selector: {selector}")
+            elements = [element for element in candidates if pattern.match(element)]
+            if elements:
+                steps = [text for text in map(node_text, elements) if text]
+                if steps:
+                    logger.info(f"=== SCRAPE DEBUG === Found {len(steps)} steps with selector '{selector}'")
+                    # Format steps nicely
+                    instructions_text = "\n\n".join([f"{i+1}. {step}" for i, step in enumerate(steps)])
+                    if len(instructions_text) > 50:  # Reasonable minimum length
+                        return instructions_text, "success"
+                else:
+                    logger.info(f"=== SCRAPE DEBUG === Selector '{selector}' found elements but no text content")
+            else:
+                logger.info(f"=== SCRAPE DEBUG === Selector '{selector}' found no elements")
+        except Exception as e:
+            logger.warning(f"=== SCRAPE DEBUG === Error with selector '{selector}': {str(e)}")
+
+    # If we get here, we failed to extract instructions using all methods
+    logger.warning("=== SCRAPE DEBUG === Failed to extract instructions using all methods")
+    return "", "not_found"
+
+
+def node_text(element) -> str:
+    """Stripped text of an element, skipping the descendant walk when it holds a single string."""
+    string = element.string
+    if string is not None:
+        return string.strip()
+    return element.get_text().strip()
+
+def url_host(url: str) -> str:
+    """Hostname of a URL without any leading www."""
+    host = urlparse(url).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+def format_steps(elements) -> str:
+    """Number the non-empty texts of step elements, or return "" if too little text was found."""
+    steps = [text for text in map(node_text, elements) if text]
+    instructions_text = "\n\n".join([f"{i+1}. {step}" for i, step in enumerate(steps)])
+    return instructions_text if len(instructions_text) > 50 else ""  # Reasonable minimum length
+
 def extract_structured_data_instructions(soup) -> str:
     """Extract recipe instructions from JSON-LD structured data"""
     # Find all script tags with type application/ld+json
-    script_tags = soup.find_all('script', type='application/ld+json')
+    for script in soup.find_all('script', type='application/ld+json'):
+        # orjson only accepts exact str, not bs4's NavigableString
+        instructions = instructions_from_ld_json(str(script.string or ""))
+        if instructions:
+            return instructions
     
-    for script in script_tags:
-        try:
-            json_data = json.loads(script.string)
+    return ""
+
+
+def instructions_from_ld_json(text: str) -> str:
+    """Extract recipe instructions from the body of one JSON-LD script"""
+    # Skip Organization, BreadcrumbList and other blocks without a recipe
+    if "Recipe" not in text and "recipe" not in text:
+        return ""
+    
+    try:
+        json_data = orjson.loads(text)
+        
+        # Handle the case when it's a list
+        if isinstance(json_data, list):
+            for item in json_data:
+                if isinstance(item, dict) and '@type' in item and item['@type'] in ['Recipe', 'recipe']:
+                    instructions = extract_instructions_from_json_ld(item)
+                    if instructions:
+                        return instructions
+        
+        # Handle single recipe object
+        elif isinstance(json_data, dict):
+            # Check if it's a Recipe type
+            if '@type' in json_data and json_data['@type'] in ['Recipe', 'recipe']:
+                instructions = extract_instructions_from_json_ld(json_data)
+                if instructions:
+                    return instructions
             
-            # Handle the case when it's a list
-            if isinstance(json_data, list):
-                for item in json_data:
+            # Sometimes recipes are nested in a Graph
+            if '@graph' in json_data and isinstance(json_data['@graph'], list):
+                for item in json_data['@graph']:
                     if isinstance(item, dict) and '@type' in item and item['@type'] in ['Recipe', 'recipe']:
                         instructions = extract_instructions_from_json_ld(item)
                         if instructions:
                             return instructions
-            
-            # Handle single recipe object
-            elif isinstance(json_data, dict):
-                # Check if it's a Recipe type
-                if '@type' in json_data and json_data['@type'] in ['Recipe', 'recipe']:
-                    instructions = extract_instructions_from_json_ld(json_data)
-                    if instructions:
-                        return instructions
-                
-                # Sometimes recipes are nested in a Graph
-                if '@graph' in json_data and isinstance(json_data['@graph'], list):
-                    for item in json_data['@graph']:
-                        if isinstance(item, dict) and '@type' in item and item['@type'] in ['Recipe', 'recipe']:
-                            instructions = extract_instructions_from_json_ld(item)
-                            if instructions:
-                                return instructions
-        except Exception as e:
-            logger.warning(f"Error parsing JSON-LD: {str(e)}")
+    except Exception as e:
+        logger.warning(f"Error parsing JSON-LD: {str(e)}")
     
     return ""
 
@@ -338,7 +780,7 @@ def extract_instructions_from_json_ld(recipe_json) -> str:
             for i, step in enumerate(steps):
                 if step.strip():
                     # Remove existing numbers if present
-                    step = re.sub(r'^\d+[\.\)]\s*', '', step.strip())
+                    step = STEP_NUMBER_RE.sub('', step.strip())
                     formatted_instructions.append(f"{i+1}. {step}")
         else:
             # If it's a single string, return it as one instruction
@@ -348,26 +790,24 @@ def extract_instructions_from_json_ld(recipe_json) -> str:
 
 
 def extract_allrecipes_instructions(soup: BeautifulSoup, html_content: str) -> Optional[str]:
-    """Extract recipe instructions specifically from AllRecipes.com"""
+    """
+    Extract recipe instructions specifically from AllRecipes.com
+
+    JSON-LD is not searched here; scrape_instructions tries it before
+    calling this.
+    """
     try:
         logger.info("Attempting specialized extraction for AllRecipes.com")
         
         # Try the modern AllRecipes selectors first (they frequently update their HTML structure)
-        selectors = [
-            ".mntl-sc-block-group--LI",  # Current AllRecipes structure
-            ".directions-container .directions__container ol li",  # Previous structure
-            ".recipe-directions__list--item",  # Older structure
-            "[data-testid='recipe-instructions'] li",  # Alternative structure
-        ]
-        
-        for selector in selectors:
+        for selector in ALLRECIPES_STEP_SELECTORS:
             instruction_elements = soup.select(selector)
             if instruction_elements and len(instruction_elements) > 0:
                 logger.info(f"Found {len(instruction_elements)} instructions using selector: {selector}")
                 steps = []
                 for i, step in enumerate(instruction_elements, 1):
-                    text = step.get_text().strip()
-                    if text and not text.lower() in ["advertisement", "watch now", "see how it's made"]:
+                    text = node_text(step)
+                    if text and not text.lower() in NOT_STEPS:
                         # Ensure we're not capturing ads or media prompts
                         steps.append(f"{i}. {text}")
                 
@@ -384,21 +824,10 @@ def extract_allrecipes_instructions(soup: BeautifulSoup, html_content: str) -> O
                 for ol in ol_elements:
                     li_elements = ol.find_all("li")
                     for i, li in enumerate(li_elements, 1):
-                        steps.append(f"{i}. {li.get_text().strip()}")
+                        steps.append(f"{i}. {node_text(li)}")
                 if steps:
                     return "\n".join(steps)
         
-        # Try looking for JSON-LD data
-        logger.info("Searching for structured data in AllRecipes.com")
-        try:
-            # AllRecipes often has recipe data in a JSON-LD format
-            structured_instructions = extract_structured_data_instructions(soup)
-            if structured_instructions:
-                logger.info("Successfully extracted instructions from JSON-LD data")
-                return structured_instructions
-        except Exception as e:
-            logger.warning(f"Error extracting JSON-LD data from AllRecipes: {str(e)}")
-        
         # Try a more general approach - find a directions section
         logger.info("Trying to find directions section by heading text")
         for heading in soup.find_all(['h2', 'h3', 'h4']):
@@ -413,7 +842,7 @@ def extract_allrecipes_instructions(soup: BeautifulSoup, html_content: str) -> O
                     for ol in ordered_lists:
                         items = ol.find_all('li')
                         for i, item in enumerate(items, 1):
-                            steps.append(f"{i}. {item.get_text().strip()}")
+                            steps.append(f"{i}. {node_text(item)}")
                     if steps:
                         return "\n".join(steps)
         
@@ -425,176 +854,159 @@ def extract_allrecipes_instructions(soup: BeautifulSoup, html_content: str) -> O
         return None
 
 
-async def generate_instructions_with_ai(recipe_data: RecipeInstructionsRequest) -> str:
-    """Generate cooking instructions using OpenAI API."""
+# Specialized extractors by hostname (without www.), tried before the generic selectors
+EXTRACTORS: Dict[str, Callable[[BeautifulSoup, str], Optional[str]]] = {
+    "allrecipes.com": extract_allrecipes_instructions,
+}
+
+
+CHEF_SYSTEM_PROMPT = "You are a professional chef who creates clear, detailed cooking instructions."
+
+
+def build_instructions_prompt(recipe_data: RecipeInstructionsRequest) -> str:
+    """Build the OpenAI prompt asking for step-by-step instructions for a recipe."""
+    # Prepare the prompt with rich context
+    ingredients_text = "\n".join([f"- {ingredient}" for ingredient in recipe_data.ingredients])
+    
+    diets_text = ""
+    if recipe_data.diets and len(recipe_data.diets) > 0:
+        diets_text = f"This recipe should be suitable for the following dietary preferences: {', '.join(recipe_data.diets)}."
+    
+    servings_text = ""
+    if recipe_data.servings:
+        servings_text = f"This recipe serves {recipe_data.servings} people."
+    
+    cuisine_text = ""
+    if recipe_data.cuisine:
+        cuisine_text = f"This is a {recipe_data.cuisine} recipe."
+    
+    # Enhanced prompt for better instructions
+    prompt = f"""
+    Create detailed cooking instructions for "{recipe_data.recipe_name}".
+    
+    INGREDIENTS:
+    {ingredients_text}
+    
+    {servings_text}
+    {cuisine_text}
+    {diets_text}
+    
+    Please provide comprehensive, step-by-step numbered instructions for preparing this dish. Include:
+    
+    1. Preparation steps (chopping, measuring, marinating, etc.)
+    2. Cooking steps with precise times and temperatures
+    3. Special techniques or tips for best results
+    4. Final presentation and serving suggestions
+    
+    Format each step as a clear instruction, and ensure the steps flow logically from start to finish.
+    Number each step for clarity.
+    """
+    
+    return prompt
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Roughly count the tokens an instructions request uses: about four characters per prompt token, plus the completion."""
+    return (len(CHEF_SYSTEM_PROMPT) + len(prompt)) // 4 + AI_MAX_TOKENS
+
+
+def create_openai_client() -> openai.AsyncOpenAI:
+    """Create an OpenAI client that times out after AI_TIMEOUT and retries twice with backoff."""
+    return openai.AsyncOpenAI(api_key=openai.api_key, timeout=AI_TIMEOUT, max_retries=2)
+
+
+@asynccontextmanager
+async def openai_session(client: Optional[openai.AsyncOpenAI], prompt: str):
+    """
+    Yield the given OpenAI client, or a short-lived one for callers outside the app.
+    
+    Requests first wait for room under OPENAI_RPM and OPENAI_TPM for `prompt`,
+    and use of the shared client waits for one of OPENAI_RATE_LIMIT slots, so
+    a burst queues here instead of failing upstream with 429s. If one gets
+    through anyway, both limits are refilled at half rate for a while.
+    """
+    global openai_limit
+    await openai_requests.acquire()
+    await openai_tokens.acquire(estimate_tokens(prompt))
+    try:
+        if client is not None:
+            if openai_limit is None:
+                openai_limit = asyncio.Semaphore(OPENAI_RATE_LIMIT)
+            async with openai_limit:
+                yield client
+        else:
+            async with create_openai_client() as own_client:
+                yield own_client
+    except openai.RateLimitError:
+        logger.warning("OpenAI rate limit reached, slowing down requests for %.0f seconds", OPENAI_BACKOFF)
+        openai_requests.back_off(OPENAI_BACKOFF)
+        openai_tokens.back_off(OPENAI_BACKOFF)
+        raise
+
+
+async def generate_instructions_with_ai(recipe_data: RecipeInstructionsRequest, client: Optional[openai.AsyncOpenAI] = None) -> str:
+    """
+    Generate cooking instructions using OpenAI API.
+    
+    Requests are awaited on the event loop; pass the app's shared client to
+    reuse its connections. Concurrent calls for the same prompt share one
+    OpenAI request.
+    """
+    prompt = build_instructions_prompt(recipe_data)
+    instructions, joined = await single_flight(
+        generating, prompt, lambda: complete_instructions(recipe_data, prompt, client)
+    )
+    if joined:
+        logger.info("Joined in-flight AI generation for: %s", recipe_data.recipe_name)
+    return instructions
+
+
+async def complete_instructions(recipe_data: RecipeInstructionsRequest, prompt: str, client: Optional[openai.AsyncOpenAI]) -> str:
+    """Ask OpenAI for instructions, falling back to basic ones if that fails."""
     try:
         logger.info("=== AI DEBUG === Starting OpenAI instructions generation")
         if not openai.api_key:
             logger.error("=== AI DEBUG === OpenAI API key not configured")
             return generate_basic_instructions(recipe_data)
         
-        # Prepare the prompt with rich context
-        ingredients_text = "\n".join([f"- {ingredient}" for ingredient in recipe_data.ingredients])
-        
-        diets_text = ""
-        if recipe_data.diets and len(recipe_data.diets) > 0:
-            diets_text = f"This recipe should be suitable for the following dietary preferences: {', '.join(recipe_data.diets)}."
-        
-        servings_text = ""
-        if recipe_data.servings:
-            servings_text = f"This recipe serves {recipe_data.servings} people."
-        
-        cuisine_text = ""
-        if recipe_data.cuisine:
-            cuisine_text = f"This is a {recipe_data.cuisine} recipe."
-        
-        # Enhanced prompt for better instructions
-        prompt = f"""
-        Create detailed cooking instructions for "{recipe_data.recipe_name}".
-        
-        INGREDIENTS:
-        {ingredients_text}
-        
-        {servings_text}
-        {cuisine_text}
-        {diets_text}
-        
-        Please provide comprehensive, step-by-step numbered instructions for preparing this dish. Include:
-        
-        1. Preparation steps (chopping, measuring, marinating, etc.)
-        2. Cooking steps with precise times and temperatures
-        3. Special techniques or tips for best results
-        4. Final presentation and serving suggestions
-        
-        Format each step as a clear instruction, and ensure the steps flow logically from start to finish.
-        Number each step for clarity.
-        """
-        
-        logger.info("=== AI DEBUG === Prepared OpenAI prompt")
-        
-        # Limit rate of OpenAI requests by checking recent request timestamps
-        now = datetime.now()
-        clean_old_requests(openai_requests, 60)  # Clean requests older than 60 seconds
-        
-        # Count requests in the last minute
-        recent_count = len(openai_requests)
-        if recent_count >= OPENAI_RATE_LIMIT:
-            logger.warning(f"=== AI DEBUG === OpenAI rate limit reached ({recent_count} requests in the last minute)")
-            oldest_request = openai_requests[0]
-            seconds_to_wait = 60 - (now - oldest_request).total_seconds()
-            if seconds_to_wait > 0:
-                logger.info(f"=== AI DEBUG === Waiting {seconds_to_wait:.1f} seconds before next OpenAI request")
-                await asyncio.sleep(seconds_to_wait)
-        
-        # Add this request to the list
-        openai_requests.append(now)
+        async with openai_session(client, prompt) as client:
+            logger.info(f"=== AI DEBUG === Using chat completions for {AI_MODEL}")
+            response = await client.chat.completions.create(
+                model=AI_MODEL,
+                messages=[
+                    {"role": "system", "content": CHEF_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7,
+                max_tokens=AI_MAX_TOKENS
+            )
+        logger.info(f"=== AI DEBUG === Received response from OpenAI chat API")
+        instructions = (response.choices[0].message.content or "").strip() if response.choices else ""
         
-        # Try different models in order of preference
-        models = ["gpt-3.5-turbo", "text-davinci-003"]
-        logger.info(f"=== AI DEBUG === Will try models in order: {', '.join(models)}")
+        if not instructions:
+            logger.warning(f"=== AI DEBUG === Empty response from OpenAI model {AI_MODEL}, falling back to basic instructions")
+            return generate_basic_instructions(recipe_data)
         
-        for model in models:
-            try:
-                logger.info(f"=== AI DEBUG === Attempting to use model: {model}")
-                
-                instructions = ""
-                
-                if model == "gpt-3.5-turbo" or model.startswith("gpt-4"):
-                    # Use the chat completions endpoint for GPT-3.5 and GPT-4
-                    logger.info(f"=== AI DEBUG === Using chat completions for {model}")
-                    response = await asyncio.wait_for(
-                        aiohttp.post(
-                            "https://api.openai.com/v1/chat/completions",
-                            headers={
-                                "Authorization": f"Bearer {openai.api_key}",
-                                "Content-Type": "application/json"
-                            },
-                            json={
-                                "model": model,
-                                "messages": [
-                                    {"role": "system", "content": "You are a professional chef who creates clear, detailed cooking instructions."},
-                                    {"role": "user", "content": prompt}
-                                ],
-                                "temperature": 0.7,
-                                "max_tokens": 1000
-                            }
-                        ),
-                        timeout=25.0
-                    )
-                    
-                    if response.status == 200:
-                        response_data = await response.json()
-                        logger.info(f"=== AI DEBUG === Received response from OpenAI chat API")
-                        if response_data.get("choices") and len(response_data["choices"]) > 0:
-                            content = response_data["choices"][0]["message"]["content"].strip()
-                            if content:
-                                instructions = content
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"=== AI DEBUG === OpenAI API error: {response.status}, {error_text}")
-                        
-                else:
-                    # Use the completions endpoint for older models
-                    logger.info(f"=== AI DEBUG === Using completions for {model}")
-                    response = await asyncio.wait_for(
-                        aiohttp.post(
-                            "https://api.openai.com/v1/completions",
-                            headers={
-                                "Authorization": f"Bearer {openai.api_key}",
-                                "Content-Type": "application/json"
-                            },
-                            json={
-                                "model": model,
-                                "prompt": prompt,
-                                "temperature": 0.7,
-                                "max_tokens": 1000
-                            }
-                        ),
-                        timeout=25.0
-                    )
-                    
-                    if response.status == 200:
-                        response_data = await response.json()
-                        logger.info(f"=== AI DEBUG === Received response from OpenAI completions API")
-                        if response_data.get("choices") and len(response_data["choices"]) > 0:
-                            content = response_data["choices"][0]["text"].strip()
-                            if content:
-                                instructions = content
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"=== AI DEBUG === OpenAI API error: {response.status}, {error_text}")
-                
-                if instructions:
-                    # Ensure instructions are properly formatted with numbers
-                    if not re.search(r'^\d+\.', instructions.split('\n')[0].strip()):
-                        # If AI didn't number the steps, let's format them
-                        logger.info(f"=== AI DEBUG === Formatting unnumbered steps from OpenAI response")
-                        steps = re.split(r'\n\s*\n', instructions)
-                        formatted_steps = []
-                        step_num = 1
-                        for step in steps:
-                            if step.strip():
-                                # Remove any existing numbers and add our own
-                                step = re.sub(r'^\d+\.\s*', '', step.strip())
-                                formatted_steps.append(f"{step_num}. {step}")
-                                step_num += 1
-                        instructions = "\n\n".join(formatted_steps)
-                    
-                    logger.info(f"=== AI DEBUG === Successfully generated instructions with OpenAI model: {model}")
-                    return instructions
-                else:
-                    logger.warning(f"=== AI DEBUG === Empty response from OpenAI model: {model}")
-                
-            except Exception as model_error:
-                logger.warning(f"=== AI DEBUG === Failed to use model {model}: {str(model_error)}")
-                # Continue to the next model
+        # Ensure instructions are properly formatted with numbers
+        if not NUMBERED_STEP_RE.match(instructions.split('\n')[0].strip()):
+            # If AI didn't number the steps, let's format them
+            logger.info(f"=== AI DEBUG === Formatting unnumbered steps from OpenAI response")
+            steps = BLANK_LINE_RE.split(instructions)
+            formatted_steps = []
+            step_num = 1
+            for step in steps:
+                if step.strip():
+                    # Remove any existing numbers and add our own
+                    step = NUMBER_PREFIX_RE.sub('', step.strip())
+                    formatted_steps.append(f"{step_num}. {step}")
+                    step_num += 1
+            instructions = "\n\n".join(formatted_steps)
         
-        # If we've tried all models and none worked, use basic instructions
-        logger.warning("=== AI DEBUG === All OpenAI model attempts failed, falling back to basic instructions")
-        return generate_basic_instructions(recipe_data)
+        logger.info(f"=== AI DEBUG === Successfully generated instructions with OpenAI model: {AI_MODEL}")
+        return instructions
         
-    except asyncio.TimeoutError:
-        logger.error("=== AI DEBUG === OpenAI API request timed out after 25 seconds")
+    except openai.APITimeoutError:
+        logger.error(f"=== AI DEBUG === OpenAI API request timed out after {AI_TIMEOUT:.0f} seconds")
         # Provide fallback basic instructions based on recipe name and ingredients
         return generate_basic_instructions(recipe_data)
     except Exception as e:
@@ -610,19 +1022,20 @@ def generate_basic_instructions(recipe_data: RecipeInstructionsRequest) -> str:
     This is a last-resort fallback to ensure users always get some instructions.
     """
     logger.info("Generating basic instructions as fallback")
-    recipe_name = recipe_data.recipe_name
-    
-    # Create a basic instructions template
+    return basic_instructions(recipe_data.recipe_name, tuple(recipe_data.ingredients))
+
+
+@lru_cache(maxsize=2048)
+def basic_instructions(recipe_name: str, ingredients: tuple) -> str:
+    """
+    Build the basic instructions text. Memoized, since a burst of failed AI
+    requests tends to fall back for the same recipes.
+    """
+    # Create a basic instructions template, listing all ingredients
+    ingredient_lines = "".join(f"\n   - {ingredient}" for ingredient in ingredients)
     instructions = f"""
 1. Gather all the ingredients for {recipe_name}:
-"""
-    
-    # Add all ingredients
-    for i, ingredient in enumerate(recipe_data.ingredients, 1):
-        instructions += f"\n   - {ingredient}"
-    
-    # Add generic preparation steps
-    instructions += f"""
+{ingredient_lines}
 
 2. Prepare your ingredients by washing, chopping, and measuring as needed.
 
@@ -643,12 +1056,19 @@ Note: These are generic instructions generated as a fallback. For detailed instr
 
 
 # Main function to get recipe instructions using hybrid approach
-async def get_recipe_instructions(recipe_data: RecipeInstructionsRequest) -> RecipeInstructionsResponse:
+async def get_recipe_instructions(
+    recipe_data: RecipeInstructionsRequest,
+    session: Optional[aiohttp.ClientSession] = None,
+    client: Optional[openai.AsyncOpenAI] = None,
+    refresh: bool = False,
+) -> RecipeInstructionsResponse:
     """
     Get cooking instructions for a recipe using a hybrid approach with priority:
     1. FIRST TRY: Scrape instructions from the provided URL
     2. IF SCRAPING FAILS: Use OpenAI API to generate instructions
     3. LAST RESORT: Use basic instructions generator if both scraping and AI generation fail
+    
+    With refresh, the cache is skipped and the entry rebuilt.
     """
     try:
         # Log start of request
@@ -657,7 +1077,8 @@ async def get_recipe_instructions(recipe_data: RecipeInstructionsRequest) -> Rec
             logger.info(f"Source URL provided: {recipe_data.source_url}")
         
         # Check cache first
-        cached_data = get_from_cache(recipe_data.recipe_id)
+        key = get_cache_key(recipe_data)
+        cached_data = None if refresh else get_from_cache(key)
         if cached_data:
             logger.info(f"Cache hit for recipe ID: {recipe_data.recipe_id}")
             return RecipeInstructionsResponse(
@@ -678,7 +1099,7 @@ async def get_recipe_instructions(recipe_data: RecipeInstructionsRequest) -> Rec
                 logger.info(f"PRIORITY #1: Attempting to scrape instructions from: {recipe_data.source_url}")
                 
                 # Use our updated scraping function with error types
-                instructions, result_type = await scrape_instructions(recipe_data.source_url)
+                instructions, result_type = await scrape_instructions(recipe_data.source_url, session)
                 
                 if instructions:
                     source = "scraped"
@@ -698,7 +1119,7 @@ async def get_recipe_instructions(recipe_data: RecipeInstructionsRequest) -> Rec
         if not instructions:
             logger.info(f"PRIORITY #2: Generating AI instructions for {recipe_data.recipe_name}")
             try:
-                instructions = await generate_instructions_with_ai(recipe_data)
+                instructions = await generate_instructions_with_ai(recipe_data, client)
                 if instructions:
                     logger.info("SUCCESS: Generated instructions with AI")
                 else:
@@ -713,8 +1134,9 @@ async def get_recipe_instructions(recipe_data: RecipeInstructionsRequest) -> Rec
                 source = "basic"
                 logger.info("Generated basic instructions as fallback")
         
-        # Cache the result
-        add_to_cache(recipe_data.recipe_id, instructions, source)
+        # Cache the result, except the basic fallback, which is cheap to rebuild
+        if source != "basic":
+            add_to_cache(key, instructions, source)
         
         # Return the response
         return RecipeInstructionsResponse(
@@ -736,13 +1158,46 @@ async def get_recipe_instructions(recipe_data: RecipeInstructionsRequest) -> Rec
 
 # API endpoints
 @app.post("/api/recipe-instructions", response_model=RecipeInstructionsResponse)
-async def get_recipe_instructions_handler(recipe_data: RecipeInstructionsRequest):
+async def get_recipe_instructions_handler(recipe_data: RecipeInstructionsRequest, background_tasks: BackgroundTasks):
     """Get cooking instructions for a recipe."""
+    # Share the response of an identical request that is already being handled
+    key = get_cache_key(recipe_data)
     try:
-        # Call the actual implementation function
-        return await get_recipe_instructions(recipe_data)
+        response, joined = await single_flight(
+            inflight, key,
+            lambda: get_recipe_instructions(recipe_data, app.state.session, app.state.openai)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if joined:
+        logger.info(f"Joined in-flight request for recipe ID: {recipe_data.recipe_id}")
+        return response.copy(update={"recipe_id": recipe_data.recipe_id})
+    
+    # Rebuild entries close to expiring once this response has been sent
+    entry = cache.get(key)
+    if response.cached and entry is not None and is_stale(entry):
+        background_tasks.add_task(refresh_instructions, recipe_data, key)
+    return response
+
+
+async def refresh_instructions(recipe_data: RecipeInstructionsRequest, key: str) -> None:
+    """
+    Rebuild a cache entry that is close to expiring, after a response has
+    served it, unless it was refreshed or is being built already.
+    """
+    entry = cache.get(key)
+    if entry is None or not is_stale(entry) or key in inflight:
+        return
+    
+    logger.info(f"Refreshing cached instructions for recipe ID: {recipe_data.recipe_id}")
+    try:
+        await single_flight(
+            inflight, key,
+            lambda: get_recipe_instructions(recipe_data, app.state.session, app.state.openai, refresh=True)
+        )
+    except Exception as e:
+        logger.warning(f"Error refreshing cached instructions: {str(e)}")
 
 
 @app.get("/api/health")
@@ -754,7 +1209,7 @@ async def health_check():
 # Error handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
     )
@@ -763,54 +1218,14 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "An unexpected error occurred. Please try again later."},
     )
 
 
-def extract_recipe_name_from_url(url: str) -> str:
-    """
-    Extract a recipe name from a URL.
-    
-    Args:
-        url: URL of the recipe
-        
-    Returns:
-        A readable recipe name extracted from the URL
-    """
-    try:
-        # Remove protocol and domain
-        path = url.split('//')[1].split('/')[1:]
-        
-        # Look for keywords in the path that might indicate a recipe name
-        recipe_segments = []
-        for segment in path:
-            # Skip common non-recipe segments
-            if segment.lower() in ['recipe', 'recipes', 'food', 'cooking', 'www.allrecipes.com']:
-                continue
-                
-            # Extract potential recipe name from segments
-            if segment and not segment.isdigit() and len(segment) > 3:
-                # Replace hyphens and underscores with spaces
-                cleaned = segment.replace('-', ' ').replace('_', ' ')
-                recipe_segments.append(cleaned)
-        
-        if recipe_segments:
-            # Use the last meaningful segment as the recipe name
-            recipe_name = recipe_segments[-1].title()
-            return recipe_name
-        else:
-            # If no meaningful segments found, use a generic name
-            return "Recipe"
-            
-    except Exception as e:
-        logger.error(f"Error extracting recipe name from URL: {str(e)}")
-        return "Recipe"
-
-
 # Only run the app directly if this script is executed directly (not imported)
 if __name__ == "__main__":
     import uvicorn
     print(f"Starting Recipe Instructions Service on http://{HOST}:{PORT}")
-    uvicorn.run(app, host=HOST, port=PORT) 
\ No newline at end of file
+    uvicorn.run(app, host=HOST, port=PORT, log_level=active_config.LOG_LEVEL.lower(), access_log=active_config.DEBUG) 
\ No newline at end of file
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify, current_app
 from services.openai_service import ask_openai, conversation_manager
 from services.user_service import get_user_preferences
+import re
+import functools
 import logging
 import uuid
 import time
@@ -196,6 +198,49 @@ def ask():
                 "conversation_id": conversation_id
             }), 500
 
+# Keywords used to classify questions in format_question
+GENERAL_ADVICE_KEYWORDS = (
+    'how can i', 'what are ways to', 'tips for', 'advice', 'recommend', 'suggestion',
+    'benefits', 'healthy', 'nutrition', 'nutrients', 'reduce', 'increase', 'lower',
+    'diet', 'alternative', 'substitute', 'instead of', 'avoid', 'without'
+)
+RECIPE_KEYWORDS = (
+    'recipe for', 'how to make', 'how do i make', 'ingredients for', 'how to cook',
+    'how to prepare', 'recipe using', 'recipe with'
+)
+MODIFICATION_KEYWORDS = ('substitute', 'alternative', 'instead of', 'replace', 'modification')
+TECHNIQUE_KEYWORDS = ('technique', 'method', 'how do i', 'process', 'best way to')
+HEALTH_KEYWORDS = (
+    'calories', 'protein', 'fat', 'carbs', 'sodium', 'sugar', 'cholesterol', 'weight', 'diet',
+    'nutrition', 'nutrient', 'vitamin', 'mineral', 'fiber', 'antioxidant', 'health', 'healthy',
+    'heart', 'diabetes', 'blood pressure', 'low-fat', 'low-carb', 'low-sodium', 'gluten',
+    'keto', 'paleo', 'vegan', 'vegetarian'
+)
+
+# More specific categories
+NUTRIENT_REDUCTION_KEYWORDS = ('reduce', 'lower', 'decrease', 'cut', 'less', 'without', 'low')
+NUTRIENT_INCREASE_KEYWORDS = ('increase', 'boost', 'more', 'higher', 'rich in', 'good source')
+SPECIFIC_NUTRIENTS = (
+    'sodium', 'salt', 'sugar', 'fat', 'carbs', 'carbohydrates', 'protein', 'fiber', 
+    'calcium', 'iron', 'potassium', 'zinc', 'vitamin', 'magnesium', 'cholesterol'
+)
+SPECIFIC_DIETS = (
+    'keto', 'paleo', 'vegan', 'vegetarian', 'pescatarian', 'mediterranean', 
+    'dash', 'gluten-free', 'dairy-free', 'low fodmap', 'whole30'
+)
+
+def keyword_pattern(keywords):
+    """Compile a pattern matching any of the keywords, to test them in one scan"""
+    return re.compile('|'.join(map(re.escape, keywords)))
+
+GENERAL_ADVICE_RE = keyword_pattern(GENERAL_ADVICE_KEYWORDS)
+RECIPE_RE = keyword_pattern(RECIPE_KEYWORDS)
+MODIFICATION_RE = keyword_pattern(MODIFICATION_KEYWORDS)
+TECHNIQUE_RE = keyword_pattern(TECHNIQUE_KEYWORDS)
+HEALTH_RE = keyword_pattern(HEALTH_KEYWORDS)
+NUTRIENT_REDUCTION_RE = keyword_pattern(NUTRIENT_REDUCTION_KEYWORDS)
+NUTRIENT_INCREASE_RE = keyword_pattern(NUTRIENT_INCREASE_KEYWORDS)
+
 def format_question(question, context=''):
     """
     Format the user's question with additional context to improve the AI response
@@ -214,48 +259,18 @@ def format_question(question, context=''):
     if context:
         formatted_question = f"Context: {context}\n\nQuestion: {formatted_question}"
     
-    # Determine question type for better classification
-    general_advice_keywords = [
-        'how can i', 'what are ways to', 'tips for', 'advice', 'recommend', 'suggestion',
-        'benefits', 'healthy', 'nutrition', 'nutrients', 'reduce', 'increase', 'lower',
-        'diet', 'alternative', 'substitute', 'instead of', 'avoid', 'without'
-    ]
-    recipe_keywords = [
-        'recipe for', 'how to make', 'how do i make', 'ingredients for', 'how to cook',
-        'how to prepare', 'recipe using', 'recipe with'
-    ]
-    modification_keywords = ['substitute', 'alternative', 'instead of', 'replace', 'modification']
-    technique_keywords = ['technique', 'method', 'how do i', 'process', 'best way to']
-    health_keywords = [
-        'calories', 'protein', 'fat', 'carbs', 'sodium', 'sugar', 'cholesterol', 'weight', 'diet',
-        'nutrition', 'nutrient', 'vitamin', 'mineral', 'fiber', 'antioxidant', 'health', 'healthy',
-        'heart', 'diabetes', 'blood pressure', 'low-fat', 'low-carb', 'low-sodium', 'gluten',
-        'keto', 'paleo', 'vegan', 'vegetarian'
-    ]
-    
-    # More specific categories
-    nutrient_reduction_keywords = ['reduce', 'lower', 'decrease', 'cut', 'less', 'without', 'low']
-    nutrient_increase_keywords = ['increase', 'boost', 'more', 'higher', 'rich in', 'good source']
-    specific_nutrients = [
-        'sodium', 'salt', 'sugar', 'fat', 'carbs', 'carbohydrates', 'protein', 'fiber', 
-        'calcium', 'iron', 'potassium', 'zinc', 'vitamin', 'magnesium', 'cholesterol'
-    ]
-    specific_diets = [
-        'keto', 'paleo', 'vegan', 'vegetarian', 'pescatarian', 'mediterranean', 
-        'dash', 'gluten-free', 'dairy-free', 'low fodmap', 'whole30'
-    ]
-    
     # Check for specific question types
-    is_explicit_recipe_request = any(keyword in formatted_question.lower() for keyword in recipe_keywords)
-    is_general_advice = any(keyword in formatted_question.lower() for keyword in general_advice_keywords)
-    is_health_related = any(keyword in formatted_question.lower() for keyword in health_keywords)
-    is_technique_question = any(keyword in formatted_question.lower() for keyword in technique_keywords)
+    lowered = formatted_question.lower()
+    is_explicit_recipe_request = bool(RECIPE_RE.search(lowered))
+    is_general_advice = bool(GENERAL_ADVICE_RE.search(lowered))
+    is_health_related = bool(HEALTH_RE.search(lowered))
+    is_technique_question = bool(TECHNIQUE_RE.search(lowered))
     
     # Specific nutrient/health categorization
-    is_nutrient_reduction = any(keyword in formatted_question.lower() for keyword in nutrient_reduction_keywords)
-    is_nutrient_increase = any(keyword in formatted_question.lower() for keyword in nutrient_increase_keywords)
-    mentioned_nutrients = [nutrient for nutrient in specific_nutrients if nutrient in formatted_question.lower()]
-    mentioned_diets = [diet for diet in specific_diets if diet in formatted_question.lower()]
+    is_nutrient_reduction = bool(NUTRIENT_REDUCTION_RE.search(lowered))
+    is_nutrient_increase = bool(NUTRIENT_INCREASE_RE.search(lowered))
+    mentioned_nutrients = [nutrient for nutrient in SPECIFIC_NUTRIENTS if nutrient in lowered]
+    mentioned_diets = [diet for diet in SPECIFIC_DIETS if diet in lowered]
     
     # Log the question classification
     logger = logging.getLogger(__name__)
@@ -334,8 +349,8 @@ The user is looking for educational content, not a complete recipe. Only include
         logger.info("Applying recipe request formatting")
         formatted_question += "\n\nPlease provide a complete recipe with ingredients, instructions, and helpful tips. Format your response with clear sections and steps."
     
-    # For modification requests
-    if any(keyword in formatted_question.lower() for keyword in modification_keywords):
+    # For modification requests, including guidance added above that mentions substitutes
+    if MODIFICATION_RE.search(formatted_question.lower()):
         logger.info("Adding modification request guidance")
         formatted_question += "\n\nPlease explain why the substitution works and how it might affect the recipe."
     
@@ -356,62 +371,97 @@ def build_system_message(user_id=None):
     Returns:
         A system message with user preferences included
     """
-    # Default values
-    dietary_context = ""
-    allergy_context = ""
-    cuisine_preferences = ""
-    cooking_skill = ""
+    # Preference values, in the order render_system_message takes them
+    context = []
     
     # Get user preferences if user_id is provided
     if user_id:
         try:
             preferences = get_user_preferences(user_id)
-            
-            # Build dietary context
-            if preferences.get('dietary_restrictions'):
-                restrictions = preferences['dietary_restrictions']
-                if isinstance(restrictions, list) and restrictions:
-                    dietary_context = f"The user follows these dietary restrictions: {', '.join(restrictions)}. "
-                    dietary_context += "Please ensure all recommendations comply with these restrictions."
-            
-            # Build allergy context
-            if preferences.get('allergies'):
-                allergies = preferences['allergies']
-                if isinstance(allergies, list) and allergies:
-                    allergy_context = f"The user has allergies to: {', '.join(allergies)}. "
-                    allergy_context += "Always avoid these ingredients and be cautious about cross-contamination."
-            
-            # Build cuisine preferences
-            if preferences.get('favorite_cuisines'):
-                cuisines = preferences['favorite_cuisines']
-                if isinstance(cuisines, list) and cuisines:
-                    cuisine_preferences = f"The user enjoys these cuisines: {', '.join(cuisines)}. "
-                    cuisine_preferences += "Consider these preferences when suggesting recipes or techniques."
-            
-            # Build cooking skill level
-            if preferences.get('cooking_skill'):
-                skill = preferences['cooking_skill']
-                if skill:
-                    skill_descriptions = {
-                        'beginner': "The user is a beginner cook. Provide simple explanations and basic techniques.",
-                        'intermediate': "The user has intermediate cooking skills. You can suggest moderately complex techniques.",
-                        'advanced': "The user is an advanced cook. Feel free to suggest complex techniques and gourmet recipes."
-                    }
-                    cooking_skill = skill_descriptions.get(skill.lower(), "")
-            
+            context.append(preference_list(preferences.get('dietary_restrictions')))
+            context.append(preference_list(preferences.get('allergies')))
+            context.append(preference_list(preferences.get('favorite_cuisines')))
+            context.append(preference_text(preferences.get('cooking_skill')))
         except Exception as e:
             current_app.logger.error(f"Error getting user preferences: {str(e)}")
-            # Continue with default system message if there's an error
+            # Continue with the preferences read so far if there's an error
+    
+    return render_system_message(*context)
+
+def preference_list(value):
+    """
+    Turn a list preference into a tuple, so it can key render_system_message.
+    Raises TypeError if the list holds anything but text.
+    """
+    if not isinstance(value, list):
+        return ()
+    if not all(isinstance(item, str) for item in value):
+        raise TypeError(f"expected a list of strings, got {value!r}")
+    return tuple(value)
+
+def preference_text(value):
+    """
+    A text preference, or an empty string if it is unset.
+    Raises TypeError if it is set to anything but text.
+    """
+    if not value:
+        return ''
+    if not isinstance(value, str):
+        raise TypeError(f"expected a string, got {value!r}")
+    return value
+
+@functools.lru_cache(maxsize=1024)
+def render_system_message(restrictions=(), allergies=(), cuisines=(), skill=''):
+    """
+    Fill in the system message template for a set of preferences. Memoized,
+    since many users share the same preferences and they rarely change.
+    
+    Args:
+        restrictions: Dietary restrictions the user follows
+        allergies: Ingredients the user is allergic to
+        cuisines: The user's favorite cuisines
+        skill: The user's cooking skill level
+        
+    Returns:
+        The system message
+    """
+    # Default values
+    dietary_context = ""
+    allergy_context = ""
+    cuisine_preferences = ""
+    cooking_skill = ""
+    
+    # Build dietary context
+    if restrictions:
+        dietary_context = f"The user follows these dietary restrictions: {', '.join(restrictions)}. "
+        dietary_context += "Please ensure all recommendations comply with these restrictions."
+    
+    # Build allergy context
+    if allergies:
+        allergy_context = f"The user has allergies to: {', '.join(allergies)}. "
+        allergy_context += "Always avoid these ingredients and be cautious about cross-contamination."
+    
+    # Build cuisine preferences
+    if cuisines:
+        cuisine_preferences = f"The user enjoys these cuisines: {', '.join(cuisines)}. "
+        cuisine_preferences += "Consider these preferences when suggesting recipes or techniques."
+    
+    # Build cooking skill level
+    if skill:
+        skill_descriptions = {
+            'beginner': "The user is a beginner cook. Provide simple explanations and basic techniques.",
+            'intermediate': "The user has intermediate cooking skills. You can suggest moderately complex techniques.",
+            'advanced': "The user is an advanced cook. Feel free to suggest complex techniques and gourmet recipes."
+        }
+        cooking_skill = skill_descriptions.get(skill.lower(), "")
     
     # Format the system message with the available context
-    system_message = SYSTEM_MESSAGE_TEMPLATE.format(
+    return SYSTEM_MESSAGE_TEMPLATE.format(
         dietary_context=dietary_context,
         allergy_context=allergy_context,
         cuisine_preferences=cuisine_preferences,
         cooking_skill=cooking_skill
     )
-    
-    return system_message
 
 @chat_bp.route('/feedback', methods=['POST'])
 def submit_feedback():
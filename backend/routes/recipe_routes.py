@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify, current_app
 from services.recipe_service import (
-    get_recipes_by_ingredients, get_recipe_details, 
+    get_recipes_by_ingredients, get_recipe_details, get_recipe_details_batch, normalize_ingredients,
     search_recipes, get_random_recipes,
     get_cuisines, get_diets, get_intolerances
 )
@@ -9,11 +9,18 @@ from services.user_service import (
     is_favorite, update_user_preferences, get_user_preferences
 )
 from models.recipe import Recipe
+from utils.http_cache import etag_response
 import asyncio
-from recipe_instructions_api import get_recipe_instructions, RecipeInstructionsRequest
+import functools
 
 recipe_bp = Blueprint('recipes', __name__)
 
+@functools.lru_cache(maxsize=1)
+def _instructions_api():
+    """Import the recipe instructions API, with its FastAPI and OpenAI dependencies, on first use."""
+    import recipe_instructions_api
+    return recipe_instructions_api
+
 @recipe_bp.route('/ingredients', methods=['GET', 'POST'])
 def find_recipes_by_ingredients_endpoint():
     """
@@ -69,8 +76,8 @@ def find_recipes_by_ingredients_endpoint():
         current_app.logger.warning("Invalid ingredients format provided")
         return jsonify({"error": "Ingredients must be a non-empty list"}), 400
     
-    # Clean ingredients (trim whitespace, convert to lowercase)
-    ingredients = [ingredient.strip().lower() for ingredient in ingredients if isinstance(ingredient, str) and ingredient.strip()]
+    # Clean ingredients (trim whitespace, convert to lowercase, drop duplicates)
+    ingredients = normalize_ingredients(ingredients)
     
     if not ingredients:
         current_app.logger.warning("No valid ingredients provided after cleaning")
@@ -141,11 +148,12 @@ def get_recipe(recipe_id):
             except Exception as e:
                 current_app.logger.warning(f"Error checking favorite status: {str(e)}")
         
-        return jsonify({
+        # Whether it is a favorite can change, so only reuse it without a user
+        return etag_response({
             "success": True,
             "recipe": recipe,
             "is_favorite": is_favorited
-        })
+        }, max_age=0 if user_id else 60)
     except Exception as e:
         current_app.logger.error(f"Error retrieving recipe {recipe_id}: {str(e)}")
         return jsonify({
@@ -153,6 +161,43 @@ def get_recipe(recipe_id):
             "error": str(e)
         }), 500
 
+@recipe_bp.route('/details/batch', methods=['POST'])
+def get_recipe_details_batch_endpoint():
+    """
+    Get detailed information about several recipes in one request
+    
+    Request body:
+    - ids: List of recipe IDs (at most 100)
+    
+    Returns:
+    - Detailed recipe information for each recipe that was found, in request order
+    """
+    data = request.get_json(silent=True) or {}
+    recipe_ids = data.get('ids')
+    
+    if not recipe_ids or not isinstance(recipe_ids, list):
+        current_app.logger.warning("Invalid recipe IDs provided for batch")
+        return jsonify({"error": "ids must be a non-empty list"}), 400
+    
+    if len(recipe_ids) > 100:
+        return jsonify({"error": "At most 100 recipe IDs can be requested at once"}), 400
+    
+    current_app.logger.info(f"Recipe details batch endpoint accessed for {len(recipe_ids)} IDs")
+    
+    try:
+        recipes = get_recipe_details_batch(recipe_ids)
+        return jsonify({
+            "success": True,
+            "count": len(recipes),
+            "recipes": recipes
+        })
+    except Exception as e:
+        current_app.logger.error(f"Error retrieving recipe details batch: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
 @recipe_bp.route('/search', methods=['GET'])
 def search_recipes_endpoint():
     """
@@ -271,7 +316,7 @@ def get_random_recipes_endpoint():
         current_app.logger.info(f"Successfully retrieved {len(recipes)} random recipes")
         
         # Return the response
-        return jsonify({
+        return etag_response({
             "success": True,
             "count": len(recipes),
             "recipes": recipes
@@ -647,8 +692,10 @@ def recipe_instructions_endpoint():
                 current_app.logger.error(f"Missing required field: {field}")
                 return jsonify({"error": f"Missing required field: {field}"}), 400
         
+        instructions_api = _instructions_api()
+        
         # Create request object
-        recipe_data = RecipeInstructionsRequest(
+        recipe_data = instructions_api.RecipeInstructionsRequest(
             recipe_id=str(data['recipe_id']),
             recipe_name=data['recipe_name'],
             source_url=data.get('source_url'),
@@ -661,7 +708,7 @@ def recipe_instructions_endpoint():
         # Use asyncio to run the async function
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        response = loop.run_until_complete(get_recipe_instructions(recipe_data))
+        response = loop.run_until_complete(instructions_api.get_recipe_instructions(recipe_data))
         loop.close()
         
         # Return the response
@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify
 import logging
 from services.supabase_service import get_saved_recipe_ids, save_recipe, remove_saved_recipe
-from services.edamam_service import get_recipe_by_id
+from services.recipe_service import get_recipe_details_batch
 
 # Create blueprint
 saved_recipes_bp = Blueprint('saved_recipes', __name__)
@@ -39,15 +39,8 @@ def get_recipe_batch():
         if not recipe_ids:
             return jsonify({"error": "Recipe IDs are required"}), 400
         
-        # Get recipe details for each ID
-        recipes = []
-        for recipe_id in recipe_ids:
-            try:
-                recipe = get_recipe_by_id(recipe_id)
-                if recipe:
-                    recipes.append(recipe)
-            except Exception as e:
-                logger.error(f"Error getting recipe details for {recipe_id}: {str(e)}")
+        # Get recipe details for all IDs with bulk lookups
+        recipes = get_recipe_details_batch(recipe_ids)
         
         # Return the list of recipe details
         return jsonify({"success": True, "recipes": recipes})
@@ -9,16 +9,36 @@ logger = logging.getLogger("shopping_list")
 # Create blueprint
 shopping_list_bp = Blueprint('shopping_list', __name__)
 
+# Basic pattern to extract quantity, unit and name
+# This is a simplified version - a production system would need more robust parsing
+INGREDIENT_RE = re.compile(r'^([\d\/\.\s]+)?\s*([a-zA-Z]+\s+)?\s*(.+)$')
+
+# Preparation words stripped from ingredient names
+PREPARATION_RE = re.compile(r'(?:fresh|frozen|dried|ground|chopped|sliced|diced|minced|grated|shredded) ')
+
+# Grocery categories, checked in order
+CATEGORY_PATTERNS = (
+    ('Produce', re.compile(r'lettuce|spinach|kale|arugula|cabbage|carrot|onion|garlic|potato|tomato|pepper|cucumber|zucchini|squash|pumpkin|broccoli|cauliflower|corn|pea|bean|lentil|fruit|apple|banana|orange|berry|lemon|lime|herb|cilantro|parsley|basil|mint|thyme|rosemary|avocado|mushroom')),
+    ('Dairy', re.compile(r'milk|cream|cheese|yogurt|butter|egg|margarine')),
+    ('Meat', re.compile(r'beef|steak|chicken|pork|ham|bacon|sausage|turkey|meat|lamb|veal')),
+    ('Seafood', re.compile(r'fish|salmon|tuna|shrimp|prawn|crab|lobster|clam|mussel|oyster|scallop|seafood')),
+    ('Baking & Spices', re.compile(r'flour|sugar|baking powder|baking soda|yeast|salt|pepper|spice|cinnamon|vanilla|cocoa|chocolate|extract')),
+    ('Grains & Pasta', re.compile(r'rice|pasta|noodle|spaghetti|macaroni|bread|cereal|oat|quinoa|barley|grain')),
+    ('Canned Goods', re.compile(r'can|canned|jar|preserved|soup|broth|stock')),
+    ('Frozen', re.compile(r'frozen|ice cream|popsicle')),
+    ('Condiments & Sauces', re.compile(r'sauce|ketchup|mustard|mayo|mayonnaise|vinegar|oil|dressing|syrup|honey|jam|jelly')),
+    ('Beverages', re.compile(r'water|juice|soda|tea|coffee|wine|beer|alcohol|drink')),
+    ('Snacks', re.compile(r'chip|cracker|nut|seed|snack|popcorn|pretzel')),
+)
+
 # Helper functions for processing ingredients
 def parse_ingredient(ingredient_str):
     """Parse an ingredient string into quantity, unit, and name."""
-    # Basic pattern to extract quantity, unit and name
-    # This is a simplified version - a production system would need more robust parsing
-    pattern = r'^([\d\/\.\s]+)?\s*([a-zA-Z]+\s+)?\s*(.+)$'
-    match = re.match(pattern, ingredient_str.strip())
+    stripped = ingredient_str.strip()
+    match = INGREDIENT_RE.match(stripped)
     
     if not match:
-        return {'amount': 1, 'unit': '', 'name': ingredient_str.strip()}
+        return {'amount': 1, 'unit': '', 'name': stripped}
     
     quantity_str, unit_str, name = match.groups()
     
@@ -83,66 +103,15 @@ def normalize_unit(unit):
 
 def normalize_ingredient_name(name):
     """Normalize ingredient names by removing preparation words."""
-    return name.lower()\
-        .replace('fresh ', '')\
-        .replace('frozen ', '')\
-        .replace('dried ', '')\
-        .replace('ground ', '')\
-        .replace('chopped ', '')\
-        .replace('sliced ', '')\
-        .replace('diced ', '')\
-        .replace('minced ', '')\
-        .replace('grated ', '')\
-        .replace('shredded ', '')\
-        .strip()
+    return PREPARATION_RE.sub('', name.lower()).strip()
 
 def categorize_ingredient(name):
     """Categorize ingredients into common grocery categories."""
     name = name.lower()
     
-    # Produce
-    if re.search(r'lettuce|spinach|kale|arugula|cabbage|carrot|onion|garlic|potato|tomato|pepper|cucumber|zucchini|squash|pumpkin|broccoli|cauliflower|corn|pea|bean|lentil|fruit|apple|banana|orange|berry|lemon|lime|herb|cilantro|parsley|basil|mint|thyme|rosemary|avocado|mushroom', name):
-        return 'Produce'
-    
-    # Dairy
-    if re.search(r'milk|cream|cheese|yogurt|butter|egg|margarine', name):
-        return 'Dairy'
-    
-    # Meat
-    if re.search(r'beef|steak|chicken|pork|ham|bacon|sausage|turkey|meat|lamb|veal', name):
-        return 'Meat'
-    
-    # Seafood
-    if re.search(r'fish|salmon|tuna|shrimp|prawn|crab|lobster|clam|mussel|oyster|scallop|seafood', name):
-        return 'Seafood'
-    
-    # Baking & Spices
-    if re.search(r'flour|sugar|baking powder|baking soda|yeast|salt|pepper|spice|cinnamon|vanilla|cocoa|chocolate|extract', name):
-        return 'Baking & Spices'
-    
-    # Grains & Pasta
-    if re.search(r'rice|pasta|noodle|spaghetti|macaroni|bread|cereal|oat|quinoa|barley|grain', name):
-        return 'Grains & Pasta'
-    
-    # Canned Goods
-    if re.search(r'can|canned|jar|preserved|soup|broth|stock', name):
-        return 'Canned Goods'
-    
-    # Frozen
-    if re.search(r'frozen|ice cream|popsicle', name):
-        return 'Frozen'
-    
-    # Condiments & Sauces
-    if re.search(r'sauce|ketchup|mustard|mayo|mayonnaise|vinegar|oil|dressing|syrup|honey|jam|jelly', name):
-        return 'Condiments & Sauces'
-    
-    # Beverages
-    if re.search(r'water|juice|soda|tea|coffee|wine|beer|alcohol|drink', name):
-        return 'Beverages'
-    
-    # Snacks
-    if re.search(r'chip|cracker|nut|seed|snack|popcorn|pretzel', name):
-        return 'Snacks'
+    for category, pattern in CATEGORY_PATTERNS:
+        if pattern.search(name):
+            return category
     
     # Default
     return 'Other'
@@ -167,6 +136,48 @@ def format_ingredient(amount, unit, name):
     amount_str = str(int(amount)) if amount == int(amount) else str(amount)
     return f"{amount_str} {unit} {name}".strip()
 
+def iter_recipe_ingredients(recipes):
+    """Yield the parsed ingredients of each recipe, one at a time."""
+    for recipe in recipes:
+        recipe_id = recipe.get('id')
+        if not recipe_id:
+            continue
+            
+        ingredients = recipe.get('extendedIngredients', [])
+        for ingredient in ingredients:
+            # Handle different ingredient formats
+            if isinstance(ingredient, str):
+                # Parse from string
+                parsed = parse_ingredient(ingredient)
+                parsed['recipeId'] = recipe_id
+                yield parsed
+            else:
+                # Already structured
+                name = normalize_ingredient_name(ingredient.get('name', ''))
+                
+                # Get amount
+                amount = ingredient.get('amount', 1)
+                if isinstance(amount, str):
+                    # Parse fractions or other formatted amounts
+                    try:
+                        if '/' in amount:
+                            num, denom = amount.split('/')
+                            amount = float(num.strip()) / float(denom.strip())
+                        else:
+                            amount = float(amount.strip())
+                    except (ValueError, TypeError):
+                        amount = 1
+                
+                # Get unit
+                unit = normalize_unit(ingredient.get('unit', ''))
+                
+                yield {
+                    'name': name,
+                    'amount': amount,
+                    'unit': unit,
+                    'recipeId': recipe_id
+                }
+
 @shopping_list_bp.route('/generate', methods=['POST'])
 def generate_shopping_list():
     """Generate a shopping list from a list of recipes."""
@@ -179,53 +190,11 @@ def generate_shopping_list():
             }), 400
         
         recipes = data['recipes']
-        all_ingredients = []
-        
-        # Extract all ingredients from all recipes
-        for recipe in recipes:
-            recipe_id = recipe.get('id')
-            if not recipe_id:
-                continue
-                
-            ingredients = recipe.get('extendedIngredients', [])
-            for ingredient in ingredients:
-                # Handle different ingredient formats
-                if isinstance(ingredient, str):
-                    # Parse from string
-                    parsed = parse_ingredient(ingredient)
-                    parsed['recipeId'] = recipe_id
-                    all_ingredients.append(parsed)
-                else:
-                    # Already structured
-                    name = normalize_ingredient_name(ingredient.get('name', ''))
-                    
-                    # Get amount
-                    amount = ingredient.get('amount', 1)
-                    if isinstance(amount, str):
-                        # Parse fractions or other formatted amounts
-                        try:
-                            if '/' in amount:
-                                num, denom = amount.split('/')
-                                amount = float(num.strip()) / float(denom.strip())
-                            else:
-                                amount = float(amount.strip())
-                        except (ValueError, TypeError):
-                            amount = 1
-                    
-                    # Get unit
-                    unit = normalize_unit(ingredient.get('unit', ''))
-                    
-                    all_ingredients.append({
-                        'name': name,
-                        'amount': amount,
-                        'unit': unit,
-                        'recipeId': recipe_id
-                    })
         
         # Aggregate ingredients
         aggregated = {}
         
-        for ingredient in all_ingredients:
+        for ingredient in iter_recipe_ingredients(recipes):
             name = ingredient['name']
             amount = ingredient['amount']
             unit = ingredient['unit']
@@ -1,8 +1,11 @@
 import os
+import atexit
 import logging
 import requests
 import json
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables
 load_dotenv()
@@ -13,6 +16,24 @@ EDAMAM_API_KEY = os.getenv("EDAMAM_API_KEY")
 print(f"Using Edamam API key: {EDAMAM_API_KEY}")
 print(f"Using Edamam APP ID: {EDAMAM_APP_ID}")
 BASE_URL = "https://api.edamam.com/api/recipes/v2"
+BULK_URL = f"{BASE_URL}/by-uri"
+BULK_LIMIT = 20  # Edamam accepts at most 20 URIs per by-uri request
+RECIPE_URI_PREFIX = "http://www.edamam.com/ontologies/edamam.owl#recipe_"
+
+# Shared session so calls to Edamam reuse pooled keep-alive connections
+# instead of paying a TCP and TLS handshake each time
+REQUEST_TIMEOUT = (3, 30)  # connect, read
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=100,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+
+@atexit.register
+def close_session():
+    """Close the pooled connections on interpreter exit."""
+    session.close()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -50,7 +71,7 @@ def get_recipes_by_ingredients(ingredients, number=10):
         logger.info(f"Making request to Edamam API: {BASE_URL} with params: {params}")
         
         try:
-            response = requests.get(BASE_URL, params=params, timeout=30)
+            response = session.get(BASE_URL, params=params, timeout=REQUEST_TIMEOUT)
             
             # Log the response status code
             logger.info(f"Response status code: {response.status_code}")
@@ -152,7 +173,7 @@ def get_recipe_details(recipe_id):
         }
         
         logger.info(f"Making request to Edamam API with URI: {edamam_uri}")
-        response = requests.get(BASE_URL, params=params)
+        response = session.get(BASE_URL, params=params, timeout=REQUEST_TIMEOUT)
         
         logger.info(f"Response status code: {response.status_code}")
         
@@ -190,7 +211,7 @@ def get_recipe_details(recipe_id):
         }
         
         logger.info(f"Making search request to: {BASE_URL}")
-        search_response = requests.get(BASE_URL, params=search_params)
+        search_response = session.get(BASE_URL, params=search_params, timeout=REQUEST_TIMEOUT)
         
         if search_response.status_code != 200:
             logger.error(f"Search request failed with status code {search_response.status_code}")
@@ -223,6 +244,52 @@ def get_recipe_details(recipe_id):
         logger.error(f"Error in get_recipe_details: {str(e)}")
         raise Exception(f"Failed to get recipe details: {str(e)}")
 
+def get_recipe_details_bulk(recipe_ids):
+    """
+    Get detailed information about several recipes, with one by-uri request
+    per BULK_LIMIT IDs instead of one request per recipe.
+    
+    Args:
+        recipe_ids (list): The IDs of the recipes
+    
+    Returns:
+        dict: Recipe details keyed by the lowercased recipe ID. IDs that Edamam
+        did not return are left out.
+    """
+    if not EDAMAM_API_KEY or not EDAMAM_APP_ID:
+        logger.error("Edamam API key or App ID not found")
+        raise Exception("Edamam API key or App ID not configured")
+    
+    ids = [str(recipe_id).lower() for recipe_id in recipe_ids]
+    recipes = {}
+    
+    for start in range(0, len(ids), BULK_LIMIT):
+        chunk = ids[start:start + BULK_LIMIT]
+        params = {
+            "type": "public",
+            "app_id": EDAMAM_APP_ID,
+            "app_key": EDAMAM_API_KEY,
+            "uri": [f"{RECIPE_URI_PREFIX}{recipe_id}" for recipe_id in chunk]
+        }
+        
+        logger.info(f"Making bulk request to Edamam API for {len(chunk)} recipes")
+        response = session.get(BULK_URL, params=params, timeout=REQUEST_TIMEOUT)
+        
+        if response.status_code != 200:
+            logger.error(f"Bulk request failed with status code {response.status_code}")
+            continue
+        
+        for hit in response.json().get("hits", []):
+            recipe = hit.get("recipe", {})
+            recipe_id = recipe.get("uri", "").rpartition("#recipe_")[2].lower()
+            if recipe_id in chunk:
+                if not recipe.get('label'):
+                    recipe['label'] = "Untitled Recipe"
+                recipes[recipe_id] = transform_edamam_recipe(recipe, recipe_id)
+    
+    logger.info(f"Bulk request returned {len(recipes)} of {len(ids)} recipes")
+    return recipes
+
 def transform_edamam_recipe(recipe, recipe_id):
     """
     Transform an Edamam recipe to match our expected format.
@@ -498,7 +565,7 @@ def search_recipes(query, cuisine="", diet="", intolerances="", number=10):
         
         # Make the API request
         logger.info(f"Making request to Edamam API: {BASE_URL}")
-        response = requests.get(BASE_URL, params=params)
+        response = session.get(BASE_URL, params=params, timeout=REQUEST_TIMEOUT)
         
         # Log the response status code
         logger.info(f"Response status code: {response.status_code}")
@@ -587,7 +654,7 @@ def get_random_recipes(tags="", number=5):
         
         # Make the API request
         logger.info(f"Making request to Edamam API: {BASE_URL}")
-        response = requests.get(BASE_URL, params=params)
+        response = session.get(BASE_URL, params=params, timeout=REQUEST_TIMEOUT)
         
         # Log the response status code
         logger.info(f"Response status code: {response.status_code}")
@@ -695,7 +762,7 @@ def get_recipe_by_id(recipe_id):
         }
         
         # Make the API request
-        response = requests.get(url, params=params)
+        response = session.get(url, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         
         # Parse the response
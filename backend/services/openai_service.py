@@ -1,4 +1,5 @@
 import os
+import re
 import logging
 import openai
 import pkg_resources
@@ -43,6 +44,9 @@ else:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Instruction lines already numbered 1-19
+NUMBERED_LINE_RE = re.compile(r'(?:1\d|[1-9])\.')
+
 class ConversationManager:
     """
     Manages conversation history for users
@@ -342,39 +346,31 @@ def post_process_response(text):
         hashes = '#' * i
         text = text.replace(f"{hashes}(\\w)", f"{hashes} \\1")
     
-    # Ensure ingredient lists use bullet points
-    if "## Ingredients:" in text or "## Ingredients" in text:
-        lines = text.split('\n')
-        in_ingredients = False
-        for i, line in enumerate(lines):
-            if line.startswith("## Ingredients"):
-                in_ingredients = True
-                continue
-            if in_ingredients and line.strip() and not line.startswith("-") and not line.startswith("##"):
-                # This is an ingredient line without a bullet point
-                if ":" in line or line[0].isdigit():  # Likely an ingredient with quantity
-                    lines[i] = f"- {line}"
-            if in_ingredients and (line.startswith("##") or not line.strip()):
-                in_ingredients = False
-        text = '\n'.join(lines)
-    
-    # Ensure instruction steps are numbered
-    if "## Instructions:" in text or "## Instructions" in text:
-        lines = text.split('\n')
-        in_instructions = False
+    # Ensure ingredient lists use bullet points and instruction steps are
+    # numbered, in one pass over the lines
+    if "## Ingredients" in text or "## Instructions" in text:
+        out = []
+        append = out.append
+        section = None
         step_number = 1
-        for i, line in enumerate(lines):
-            if line.startswith("## Instructions"):
-                in_instructions = True
-                continue
-            if in_instructions and line.strip() and not line.startswith("1.") and not line.startswith("##"):
-                # This is an instruction line without numbering
-                if not any(line.startswith(f"{j}.") for j in range(1, 20)):  # Not already numbered
-                    lines[i] = f"{step_number}. {line}"
+        for line in text.split('\n'):
+            if line.startswith("## Ingredients"):
+                section = "ingredients"
+            elif line.startswith("## Instructions"):
+                section = "instructions"
+            elif line.startswith("##") or not line.strip():
+                section = None
+            elif section == "ingredients":
+                # An ingredient line without a bullet point, likely with a quantity
+                if not line.startswith("-") and (":" in line or line[0].isdigit()):
+                    line = f"- {line}"
+            elif section == "instructions":
+                # An instruction line without numbering
+                if not NUMBERED_LINE_RE.match(line):
+                    line = f"{step_number}. {line}"
                     step_number += 1
-            if in_instructions and (line.startswith("##") or not line.strip()):
-                in_instructions = False
-        text = '\n'.join(lines)
+            append(line)
+        text = '\n'.join(out)
     
     # Add spacing between sections for better readability
     text = text.replace("##", "\n##")
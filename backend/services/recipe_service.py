@@ -1,8 +1,12 @@
 import os
 import logging
 import sys
+import threading
+from cachetools import TTLCache
+from cachetools.keys import hashkey
 from dotenv import load_dotenv
 from services import edamam_service
+from config.config import active_config
 
 # Add the parent directory to the path to fix imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,10 +25,59 @@ try:
 except Exception as e:
     print(f"Error importing edamam_service: {str(e)}")
 
-# Force using Edamam API
-API_PROVIDER = 'edamam'
+# Recipe API provider; Edamam is the only one implemented
+API_PROVIDER = active_config.API_PROVIDER
+if API_PROVIDER != 'edamam':
+    logger.warning(f"API_PROVIDER '{API_PROVIDER}' is not supported, using 'edamam'")
+    API_PROVIDER = 'edamam'
 logger.info(f"Recipe Service initialized with API_PROVIDER: {API_PROVIDER}")
-print(f"Recipe Service initialized with API_PROVIDER: {API_PROVIDER}")
+
+# In-process caches for the read-only Edamam lookups. Random recipes are kept
+# briefly so repeated page loads don't always show the same ones.
+CACHE_TTL = int(os.getenv("CACHE_TTL", "86400"))
+RANDOM_CACHE_TTL = int(os.getenv("RANDOM_CACHE_TTL", "600"))
+_details_cache = TTLCache(maxsize=4096, ttl=CACHE_TTL)
+_ingredients_cache = TTLCache(maxsize=2048, ttl=CACHE_TTL)
+_random_cache = TTLCache(maxsize=256, ttl=RANDOM_CACHE_TTL)
+_cache_lock = threading.Lock()
+
+# Upper bound on the ingredients sent upstream, which keeps the query string short
+MAX_INGREDIENTS = int(os.getenv("MAX_INGREDIENTS", "32"))
+
+def normalize_ingredients(ingredients, limit=MAX_INGREDIENTS):
+    """
+    Trim and lowercase ingredient names, dropping blanks and duplicates.
+
+    Args:
+        ingredients (iterable): Raw ingredient names; non-strings are skipped
+        limit (int): Maximum number of ingredients to keep
+
+    Returns:
+        list: Unique ingredient names in their original order
+    """
+    seen = {}
+    for ingredient in ingredients:
+        if not isinstance(ingredient, str):
+            continue
+        name = ingredient.strip().lower()
+        if name and name not in seen:
+            seen[name] = None
+            if len(seen) == limit:
+                break
+    return list(seen)
+
+def _cached(cache, key, fetch):
+    """Return the cached result for key, calling fetch and storing its result on a miss."""
+    with _cache_lock:
+        result = cache.get(key)
+    if result is not None:
+        logger.info("Recipe cache hit")
+        return result
+    
+    result = fetch()
+    with _cache_lock:
+        cache[key] = result
+    return result
 
 def get_recipes_by_ingredients(ingredients, number=5, ranking=1, ignore_pantry=False, api_provider=None):
     """
@@ -53,13 +106,18 @@ def get_recipes_by_ingredients(ingredients, number=5, ranking=1, ignore_pantry=F
             raise ValueError("Ingredients must be a non-empty list")
         
         # Clean ingredients
-        clean_ingredients = [i.strip().lower() for i in ingredients if isinstance(i, str) and i.strip()]
+        clean_ingredients = normalize_ingredients(ingredients)
         if not clean_ingredients:
             logger.error("No valid ingredients after cleaning")
             raise ValueError("No valid ingredients provided")
             
         logger.info(f"Calling edamam_service.get_recipes_by_ingredients with ingredients: {clean_ingredients}")
-        return edamam_service.get_recipes_by_ingredients(clean_ingredients, number)
+        # Key on the sorted ingredients so any order of the same list hits the cache
+        return _cached(
+            _ingredients_cache,
+            hashkey(tuple(sorted(clean_ingredients)), number),
+            lambda: edamam_service.get_recipes_by_ingredients(clean_ingredients, number)
+        )
     except Exception as e:
         logger.error(f"Error in get_recipes_by_ingredients: {str(e)}")
         raise Exception(f"Failed to get recipes by ingredients: {str(e)}")
@@ -80,11 +138,60 @@ def get_recipe_details(recipe_id, api_provider=None):
     
     try:
         logger.info("Calling edamam_service.get_recipe_details")
-        return edamam_service.get_recipe_details(recipe_id)
+        return _cached(_details_cache, hashkey(str(recipe_id)), lambda: edamam_service.get_recipe_details(recipe_id))
     except Exception as e:
         logger.error(f"Error using Edamam API: {str(e)}")
         raise Exception(f"Failed to get recipe details: {str(e)}")
 
+def get_recipe_details_batch(recipe_ids, api_provider=None):
+    """
+    Get detailed information about several recipes using Edamam API.
+    
+    Cached recipes are served from memory and the rest are fetched with bulk
+    requests. Recipes the bulk lookup misses fall back to get_recipe_details.
+    
+    Args:
+        recipe_ids (list): The IDs of the recipes
+        api_provider (str): Not used, always uses Edamam
+        
+    Returns:
+        list: Recipe details, in request order, for the recipes that were found
+    """
+    ids = list(dict.fromkeys(str(recipe_id) for recipe_id in recipe_ids if recipe_id))
+    logger.info(f"Using Edamam API for get_recipe_details_batch with {len(ids)} IDs")
+    
+    found = {}
+    with _cache_lock:
+        for recipe_id in ids:
+            recipe = _details_cache.get(hashkey(recipe_id))
+            if recipe is not None:
+                found[recipe_id] = recipe
+    
+    missing = [recipe_id for recipe_id in ids if recipe_id not in found]
+    if missing:
+        try:
+            fetched = edamam_service.get_recipe_details_bulk(missing)
+        except Exception as e:
+            logger.error(f"Error using Edamam bulk API: {str(e)}")
+            fetched = {}
+        
+        for recipe_id in missing:
+            recipe = fetched.get(recipe_id.lower())
+            if recipe is None:
+                try:
+                    recipe = get_recipe_details(recipe_id)
+                except Exception as e:
+                    logger.error(f"Error getting recipe details for {recipe_id}: {str(e)}")
+                    continue
+            found[recipe_id] = recipe
+        
+        with _cache_lock:
+            for recipe_id in missing:
+                if recipe_id in found:
+                    _details_cache[hashkey(recipe_id)] = found[recipe_id]
+    
+    return [found[recipe_id] for recipe_id in ids if recipe_id in found]
+
 def search_recipes(query, cuisine=None, diet=None, intolerances=None, number=10, api_provider=None):
     """
     Search for recipes by query and filters using Edamam API.
@@ -127,7 +234,7 @@ def get_random_recipes(tags="", number=5, api_provider=None):
     
     try:
         logger.info("Calling edamam_service.get_random_recipes")
-        return edamam_service.get_random_recipes(tags, number)
+        return _cached(_random_cache, hashkey(tags, number), lambda: edamam_service.get_random_recipes(tags, number))
     except Exception as e:
         logger.error(f"Error using Edamam API: {str(e)}")
         raise Exception(f"Failed to get random recipes: {str(e)}")
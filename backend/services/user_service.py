@@ -1,12 +1,19 @@
+import os
 import logging
+import threading
+from collections import OrderedDict
 from models.user import User
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# In-memory user storage
-_users = {}
+# In-memory user storage, least recently used users are dropped first. Favorites
+# and preferences are saved in the database as they change, so an evicted user
+# is reloaded with both on the next request.
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+_users = OrderedDict()
+_users_lock = threading.Lock()
 
 def get_user(user_id):
     """
@@ -18,10 +25,17 @@ def get_user(user_id):
     Returns:
         User: The user object
     """
-    if user_id not in _users:
+    with _users_lock:
+        user = _users.get(user_id)
+        if user is not None:
+            _users.move_to_end(user_id)
+            return user
+        
         logger.info(f"Creating new user with ID: {user_id}")
-        _users[user_id] = User(user_id)
-    return _users[user_id]
+        user = _users[user_id] = User(user_id)
+        if len(_users) > USER_CACHE_SIZE:
+            _users.popitem(last=False)
+        return user
 
 def get_user_favorites(user_id, limit=None, sort_by='added_at', reverse=True):
     """
@@ -25,6 +25,9 @@ load_dotenv()
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Runs of whitespace collapsed in transcripts
+WHITESPACE_RE = re.compile(r'\s+')
+
 def extract_video_id(youtube_url):
     """
     Extract video ID from various YouTube URL formats
@@ -87,7 +90,7 @@ def get_video_transcript(youtube_url):
         transcript_text = ' '.join([item['text'] for item in transcript_list])
         
         # Clean up the transcript (remove excessive spaces, etc.)
-        transcript_text = re.sub(r'\s+', ' ', transcript_text).strip()
+        transcript_text = WHITESPACE_RE.sub(' ', transcript_text).strip()
         
         logger.info(f"Successfully retrieved transcript for video ID: {video_id}")
         return {
@@ -8,6 +8,7 @@ from unittest.mock import patch, MagicMock
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import app
+from routes.chat_routes import build_system_message
 
 class TestChatRoutes(unittest.TestCase):
     def setUp(self):
@@ -118,5 +119,37 @@ class TestChatRoutes(unittest.TestCase):
         data = json.loads(response.data)
         self.assertIn('error', data)
 
+    @patch('routes.chat_routes.get_user_preferences')
+    def test_system_message_with_malformed_preferences(self, mock_preferences):
+        restrictions = "The user follows these dietary restrictions: vegan."
+        allergies = "The user has allergies to: peanuts."
+        cuisines = "The user enjoys these cuisines: thai."
+        skill = "The user is a beginner cook."
+        preferences = {
+            'dietary_restrictions': ['vegan'],
+            'allergies': ['peanuts'],
+            'favorite_cuisines': ['thai'],
+            'cooking_skill': 'Beginner'
+        }
+        cases = [
+            # (overrides, sentences kept, sentences dropped)
+            ({}, [restrictions, allergies, cuisines, skill], []),
+            # Values of the wrong type are ignored
+            ({'allergies': 'peanuts', 'cooking_skill': None}, [restrictions, cuisines], [allergies, skill]),
+            # A malformed value keeps the preferences read before it
+            ({'cooking_skill': 5}, [restrictions, allergies, cuisines], [skill]),
+            ({'favorite_cuisines': ['thai', None]}, [restrictions, allergies], [cuisines, skill]),
+            ({'dietary_restrictions': [1]}, [], [restrictions, allergies, cuisines, skill]),
+        ]
+        with app.app_context():
+            for overrides, kept, dropped in cases:
+                with self.subTest(overrides=overrides):
+                    mock_preferences.return_value = {**preferences, **overrides}
+                    message = build_system_message('user123')
+                    for sentence in kept:
+                        self.assertIn(sentence, message)
+                    for sentence in dropped:
+                        self.assertNotIn(sentence, message)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,111 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the services
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.recipe_service import normalize_ingredients
+from routes.shopping_list_routes import (
+    parse_ingredient, normalize_unit, normalize_ingredient_name,
+    categorize_ingredient, iter_recipe_ingredients
+)
+
+class TestNormalizeIngredients(unittest.TestCase):
+    def test_normalize_ingredients(self):
+        cases = [
+            # (ingredients, limit, expected)
+            (['Chicken', ' rice '], 32, ['chicken', 'rice']),
+            (['', '   ', 'Egg'], 32, ['egg']),
+            ([None, 3, {'name': 'egg'}, 'egg'], 32, ['egg']),
+            (['egg', 'EGG', ' Egg ', 'milk', 'egg'], 32, ['egg', 'milk']),
+            (['a', 'b', 'a', 'c', 'd'], 3, ['a', 'b', 'c']),
+            ([], 32, []),
+            ('tomato, basil'.split(','), 32, ['tomato', 'basil']),
+        ]
+        for ingredients, limit, expected in cases:
+            with self.subTest(ingredients=ingredients, limit=limit):
+                self.assertEqual(normalize_ingredients(ingredients, limit), expected)
+
+class TestShoppingListHelpers(unittest.TestCase):
+    def test_parse_ingredient(self):
+        cases = [
+            ('2 cups flour', {'amount': 2.0, 'unit': 'cups', 'name': 'flour'}),
+            ('1/2 tsp salt', {'amount': 0.5, 'unit': 'tsp', 'name': 'salt'}),
+            ('1.5 lb chicken breast', {'amount': 1.5, 'unit': 'lb', 'name': 'chicken breast'}),
+            ('  3 eggs  ', {'amount': 3.0, 'unit': '', 'name': 'eggs'}),
+            ('250 g butter', {'amount': 250.0, 'unit': 'g', 'name': 'butter'}),
+            ('4 large tomatoes', {'amount': 4.0, 'unit': 'large', 'name': 'tomatoes'}),
+            ('10 oz. spinach', {'amount': 10.0, 'unit': '', 'name': 'oz. spinach'}),
+            ('salt to taste', {'amount': 1, 'unit': 'salt', 'name': 'to taste'}),
+            ('Olive oil', {'amount': 1, 'unit': 'Olive', 'name': 'oil'}),
+            # Quantities that don't parse default to 1
+            ('1 1/2 cups sugar', {'amount': 1, 'unit': 'cups', 'name': 'sugar'}),
+            ('1/2/3 cups x', {'amount': 1, 'unit': 'cups', 'name': 'x'}),
+            ('. cups rice', {'amount': 1, 'unit': 'cups', 'name': 'rice'}),
+        ]
+        for ingredient, expected in cases:
+            with self.subTest(ingredient=ingredient):
+                self.assertEqual(parse_ingredient(ingredient), expected)
+
+    def test_normalize_unit(self):
+        cases = [
+            ('Tsp', 'tsp'), ('tablespoons', 'tbsp'), (' C ', 'cup'), ('fl oz', 'oz'),
+            ('Litres', 'liter'), ('kg', 'kg'), ('pounds', 'lb'), ('Grams', 'g'),
+            ('whole', ''), ('', ''), ('pinch', 'pinch'),
+        ]
+        for unit, expected in cases:
+            with self.subTest(unit=unit):
+                self.assertEqual(normalize_unit(unit), expected)
+
+    def test_normalize_ingredient_name(self):
+        cases = [
+            ('Fresh Basil', 'basil'),
+            ('chopped fresh parsley', 'parsley'),
+            ('frozen peas', 'peas'),
+            ('Ground Beef', 'beef'),
+            ('diced  onion', 'onion'),
+            ('Freshwater fish', 'freshwater fish'),
+            ('minced garlic ', 'garlic'),
+            ('grated Parmesan cheese', 'parmesan cheese'),
+            ('Shredded Mozzarella', 'mozzarella'),
+        ]
+        for name, expected in cases:
+            with self.subTest(name=name):
+                self.assertEqual(normalize_ingredient_name(name), expected)
+
+    def test_categorize_ingredient(self):
+        # Categories are checked in order, so e.g. "pepper" is Produce and
+        # "peanut butter" matches "pea" first
+        cases = [
+            ('Spinach', 'Produce'), ('black pepper', 'Produce'), ('canned tomatoes', 'Produce'),
+            ('Peanut butter', 'Produce'), ('whole milk', 'Dairy'), ('ice cream', 'Dairy'),
+            ('chicken thighs', 'Meat'), ('chicken broth', 'Meat'), ('salmon fillet', 'Seafood'),
+            ('all-purpose flour', 'Baking & Spices'), ('vanilla extract', 'Baking & Spices'),
+            ('brown rice', 'Grains & Pasta'), ('soy sauce', 'Condiments & Sauces'),
+            ('green tea', 'Beverages'), ('mixed nuts', 'Snacks'), ('tofu', 'Other'),
+        ]
+        for name, expected in cases:
+            with self.subTest(name=name):
+                self.assertEqual(categorize_ingredient(name), expected)
+
+    def test_iter_recipe_ingredients(self):
+        recipes = [
+            {'id': 1, 'extendedIngredients': [
+                '2 cups flour',
+                {'name': 'Fresh Basil', 'amount': '1/2', 'unit': 'Cups'},
+                {'name': 'salt', 'amount': 'a pinch', 'unit': ''},
+                {'name': 'eggs', 'amount': 3, 'unit': 'whole'},
+            ]},
+            # Recipes without an ID are skipped
+            {'extendedIngredients': ['1 cup sugar']},
+        ]
+        self.assertEqual(list(iter_recipe_ingredients(recipes)), [
+            {'amount': 2.0, 'unit': 'cups', 'name': 'flour', 'recipeId': 1},
+            {'name': 'basil', 'amount': 0.5, 'unit': 'cup', 'recipeId': 1},
+            {'name': 'salt', 'amount': 1, 'unit': '', 'recipeId': 1},
+            {'name': 'eggs', 'amount': 3, 'unit': '', 'recipeId': 1},
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
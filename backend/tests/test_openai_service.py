@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the services
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.openai_service import post_process_response
+
+class TestPostProcessResponse(unittest.TestCase):
+    def test_numbered_instructions_are_kept(self):
+        text = "## Instructions\n1. Boil the water.\n2. Add the pasta.\n3. Drain."
+        self.assertEqual(post_process_response(text),
+                         "\n## Instructions\n1. Boil the water.\n2. Add the pasta.\n3. Drain.")
+
+    def test_unnumbered_instructions_are_numbered(self):
+        # Numbering stops at the first blank line
+        text = "## Instructions\nBoil the water.\nAdd the pasta.\n\nEnjoy!"
+        self.assertEqual(post_process_response(text),
+                         "\n## Instructions\n1. Boil the water.\n2. Add the pasta.\n\nEnjoy!")
+
+    def test_bulleted_ingredients_are_kept(self):
+        text = "## Ingredients\n- 2 cups flour\n- 1 egg\n## Instructions\n1. Mix."
+        self.assertEqual(post_process_response(text),
+                         "\n## Ingredients\n- 2 cups flour\n- 1 egg\n\n## Instructions\n1. Mix.")
+
+    def test_mixed_answer(self):
+        text = (
+            "Here is a recipe.\n"
+            "##Ingredients\n"
+            "## Ingredients\n"
+            "2 cups flour\n"
+            "Salt: a pinch\n"
+            "- 1 egg\n"
+            "water\n"
+            "## Instructions\n"
+            "Mix the flour.\n"
+            "2. Add the egg.\n"
+            "Bake for 20 minutes.\n"
+            "12. Serve.\n"
+            "\n\n\n"
+            "Enjoy!"
+        )
+        expected = (
+            "Here is a recipe.\n"
+            "\n##Ingredients\n"
+            "\n## Ingredients\n"
+            "- 2 cups flour\n"
+            "- Salt: a pinch\n"
+            "- 1 egg\n"
+            # Lines without a quantity are left alone
+            "water\n"
+            "\n## Instructions\n"
+            "1. Mix the flour.\n"
+            "2. Add the egg.\n"
+            # Steps are counted separately from the numbers already present
+            "2. Bake for 20 minutes.\n"
+            "12. Serve.\n"
+            "\n"
+            "Enjoy!"
+        )
+        self.assertEqual(post_process_response(text), expected)
+
+    def test_answer_without_sections_is_unchanged(self):
+        text = "Pasta is best cooked al dente."
+        self.assertEqual(post_process_response(text), text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -101,6 +101,33 @@ class TestRecipeRoutes(unittest.TestCase):
         # Check that the service was called with the right parameters
         mock_random.assert_called_once_with('vegetarian')
 
+    @patch('routes.recipe_routes.get_recipe_details')
+    def test_get_recipe_not_modified(self, mock_get_details):
+        # Mock the service function
+        mock_get_details.return_value = {'id': 123, 'title': 'Pasta Carbonara'}
+
+        # The first response carries an ETag
+        response = self.app.get('/api/recipes/123')
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers.get('ETag')
+        self.assertIsNotNone(etag)
+
+        # Sending it back returns 304 with an empty body
+        response = self.app.get('/api/recipes/123', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    @patch('routes.recipe_routes.get_random_recipes')
+    def test_get_random_recipes_revalidates(self, mock_random):
+        # Mock the service function
+        mock_random.return_value = [{'id': 1, 'title': 'Random Recipe 1'}]
+
+        # Random recipes must not be reused without asking the server again
+        response = self.app.get('/api/recipes/random?tags=vegetarian')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers.get('Cache-Control'), 'private, no-cache')
+        self.assertIsNotNone(response.headers.get('ETag'))
+
     @patch('routes.recipe_routes.get_user_favorites')
     def test_get_favorites_endpoint(self, mock_favorites):
         # Mock the service function
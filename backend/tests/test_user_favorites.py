@@ -0,0 +1,153 @@
+import unittest
+import json
+import sys
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the models
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models import store
+from models import user as user_module
+from models.user import User
+from services import user_service
+
+class TestUserFavorites(unittest.TestCase):
+    def setUp(self):
+        # Give each test its own database and legacy favorites directory
+        self.data_dir = tempfile.mkdtemp()
+        self.users_dir = os.path.join(self.data_dir, 'users')
+        os.makedirs(self.users_dir)
+        patches = [
+            patch.object(store, 'DB_PATH', os.path.join(self.data_dir, 'app.db')),
+            patch.object(store, '_connection', None),
+            patch.object(user_module, 'LEGACY_FAVORITES_DIR', self.users_dir),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self.close_connection)
+
+    def close_connection(self):
+        if store._connection is not None:
+            store._connection.close()
+        shutil.rmtree(self.data_dir)
+
+    def test_add_and_remove_favorite(self):
+        user = User('user123')
+        self.assertTrue(user.add_favorite({'id': 1, 'title': 'Pasta'}))
+        self.assertTrue(user.is_favorite(1))
+        self.assertTrue(user.is_favorite('1'))
+
+        self.assertTrue(user.remove_favorite('1'))
+        self.assertFalse(user.is_favorite(1))
+        self.assertEqual(user.get_favorites(), [])
+
+        # Removing it again does nothing
+        self.assertFalse(user.remove_favorite(1))
+
+    def test_duplicate_favorite(self):
+        user = User('user123')
+        self.assertTrue(user.add_favorite({'id': 1, 'title': 'Pasta'}))
+        self.assertFalse(user.add_favorite({'id': 1, 'title': 'Pasta'}))
+        self.assertEqual(len(user.get_favorites()), 1)
+
+    def test_favorites_are_persisted(self):
+        user = User('user123')
+        user.add_favorite({'id': 1, 'title': 'Pasta'})
+        user.add_favorite({'id': 'recipe_abc', 'title': 'Curry'})
+        user.remove_favorite(1)
+
+        # A new instance reads them back from the database
+        reloaded = User('user123')
+        self.assertEqual([fav['title'] for fav in reloaded.get_favorites()], ['Curry'])
+        self.assertTrue(reloaded.is_favorite('recipe_abc'))
+        self.assertFalse(reloaded.add_favorite({'id': 'recipe_abc', 'title': 'Curry'}))
+
+        # Other users don't see them
+        self.assertEqual(User('user456').get_favorites(), [])
+
+    def test_migrates_legacy_json_favorites(self):
+        legacy = [
+            {'id': 1, 'title': 'Pasta', 'added_at': 100},
+            {'id': 2, 'title': 'Curry', 'added_at': 200},
+        ]
+        path = os.path.join(self.users_dir, 'user123_favorites.json')
+        with open(path, 'w') as f:
+            json.dump(legacy, f)
+
+        user = User('user123')
+        self.assertEqual(user.get_favorites(), [legacy[1], legacy[0]])
+        self.assertTrue(user.is_favorite(2))
+
+        # The file is kept, renamed so it is not imported again
+        self.assertFalse(os.path.exists(path))
+        self.assertTrue(os.path.exists(f"{path}.migrated"))
+
+        # The favorites now come from the database
+        reloaded = User('user123')
+        self.assertEqual(reloaded.get_favorites(), [legacy[1], legacy[0]])
+        self.assertFalse(reloaded.add_favorite({'id': 1, 'title': 'Pasta'}))
+
+    def test_get_favorites_ordering(self):
+        user = User('user123')
+        favorites = [
+            {'id': 1, 'title': 'B', 'added_at': 300, 'rating': 2},
+            {'id': 2, 'title': 'A', 'added_at': 100, 'rating': 5},
+            {'id': 3, 'title': 'C', 'added_at': 200, 'rating': 4},
+        ]
+        user.favorites = favorites
+        user._fav_index = {str(fav['id']): fav for fav in favorites}
+
+        cases = [
+            # (limit, sort_by, reverse, expected ids)
+            (None, 'added_at', True, [1, 3, 2]),
+            (None, 'added_at', False, [2, 3, 1]),
+            (2, 'added_at', True, [1, 3]),
+            (2, 'added_at', False, [2, 3]),
+            (1, 'rating', True, [2]),
+            (None, 'title', False, [2, 1, 3]),
+            (0, 'rating', True, [2, 3, 1]),
+            # Without the sort field, the stored order is kept
+            (None, 'missing', True, [1, 2, 3]),
+            (2, 'missing', True, [1, 2]),
+        ]
+        for limit, sort_by, reverse, expected in cases:
+            with self.subTest(limit=limit, sort_by=sort_by, reverse=reverse):
+                result = user.get_favorites(limit=limit, sort_by=sort_by, reverse=reverse)
+                self.assertEqual([fav['id'] for fav in result], expected)
+
+    def test_get_favorites_default_is_newest_first(self):
+        user = User('user123')
+        with patch('models.user.time.time', side_effect=[100, 200, 300]):
+            for recipe_id in (1, 2, 3):
+                user.add_favorite({'id': recipe_id})
+        self.assertEqual([fav['id'] for fav in user.get_favorites()], [3, 2, 1])
+        self.assertEqual([fav['id'] for fav in user.get_favorites(limit=2)], [3, 2])
+
+    def test_preferences_are_persisted(self):
+        user = User('user123')
+        user.update_preferences({'diets': ['vegan'], 'cuisines': ['thai'], 'unknown': 1})
+        
+        reloaded = User('user123')
+        self.assertEqual(reloaded.preferences, {'diets': ['vegan'], 'intolerances': [], 'cuisines': ['thai']})
+        self.assertEqual(User('user456').preferences, {'diets': [], 'intolerances': [], 'cuisines': []})
+
+    def test_preferences_survive_eviction(self):
+        with patch.object(user_service, 'USER_CACHE_SIZE', 1), \
+                patch.object(user_service, '_users', OrderedDict()):
+            user_service.update_user_preferences('user123', {'intolerances': ['peanut']})
+            user_service.add_favorite('user123', {'id': 1, 'title': 'Pasta'})
+            
+            # Loading another user evicts the first one
+            user_service.get_user('user456')
+            self.assertNotIn('user123', user_service._users)
+            
+            self.assertEqual(user_service.get_user_preferences('user123')['intolerances'], ['peanut'])
+            self.assertTrue(user_service.is_favorite('user123', 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import hashlib
+from flask import jsonify, request
+
+def etag_response(payload, max_age=0):
+    """
+    Build a JSON response with a weak ETag, answering 304 when it matches
+    the client's If-None-Match
+
+    Args:
+        payload: The data to serialize
+        max_age: How long clients may reuse the response without revalidating.
+            Leave at 0 for anything that changes, like random or per-user data.
+
+    Returns:
+        Flask response object
+    """
+    response = jsonify(payload)
+    tag = hashlib.blake2b(response.get_data(), digest_size=16).hexdigest()
+    response.set_etag(tag, weak=True)
+    if max_age:
+        response.headers['Cache-Control'] = f'private, max-age={max_age}'
+    else:
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
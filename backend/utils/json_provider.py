@@ -0,0 +1,30 @@
+import decimal
+import orjson
+from flask.json.provider import JSONProvider
+
+def _default(obj):
+    """Serialize the types orjson does not handle natively."""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider for Flask backed by orjson
+
+    Used by jsonify and request.get_json. Responses are built from the bytes
+    orjson produces, without a round trip through str.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype='application/json')
@@ -1,6 +1,62 @@
 import os
+import sys
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs')
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# The running listener, so a second setup call doesn't start another
+_listener = None
+
+def setup_queue_logging(level, filename='app.log'):
+    """
+    Route all logging through a queue drained by a background thread
+
+    Request threads only enqueue records; the listener thread writes them to
+    stdout and to a rotating file under logs/, so disk and console I/O stay
+    off the request path. Later calls only update the root log level.
+
+    Args:
+        level: Root log level, as a name or number
+        filename: Log file name under logs/, or None to log to stdout only
+
+    Returns:
+        QueueListener: The started listener, stopped automatically at exit
+    """
+    global _listener
+    if _listener is not None:
+        logging.getLogger().setLevel(level)
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if filename:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        handlers.append(RotatingFileHandler(
+            os.path.join(LOG_DIR, filename),
+            maxBytes=50_000_000,
+            backupCount=5
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # The queue handler only renders the message (with any traceback) so the
+    # listener's handlers apply the full format once
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    # force replaces the handlers the services set up on import
+    logging.basicConfig(level=level, handlers=[queue_handler], force=True)
+    _listener = listener
+    return listener
 
 def setup_logger(app):
     """
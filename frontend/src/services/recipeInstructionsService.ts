@@ -2,7 +2,7 @@ import axios from 'axios';
 import { Recipe } from '../types';
 
 // Define the base URL for the API
-const API_BASE_URL = process.env.REACT_APP_API_BASE_URL || 'http://localhost:8003';
+const API_BASE_URL = process.env.REACT_APP_API_BASE_URL || 'http://localhost:5000';
 
 // Define interfaces for the request and response
 export interface RecipeInstructionsRequest {
@@ -67,7 +67,7 @@ async function getRecipeInstructions(
       try {
         // Make the API call to the specialized AllRecipes API
         const response = await axios.post(
-          `${API_BASE_URL.replace('8003', '8002')}/api/allrecipes`,
+          `${API_BASE_URL}/api/allrecipes`,
           { url: request.source_url },
           {
             headers: { 'Content-Type': 'application/json' },
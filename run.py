@@ -2,6 +2,7 @@ import os
 import subprocess
 import sys
 import time
+import urllib.request
 import webbrowser
 from threading import Thread
 
@@ -84,9 +85,23 @@ def run_frontend():
     except KeyboardInterrupt:
         print("Frontend stopped by user")
 
+def wait_ready(url, timeout=5):
+    """Poll a URL until it responds, backing off up to 200ms between tries."""
+    deadline = time.monotonic() + timeout
+    delay = 0.02
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=0.2)
+            return True
+        except Exception:
+            time.sleep(delay)
+            delay = min(delay * 1.6, 0.2)
+    return False
+
 def open_browser():
-    """Open the browser after a delay."""
-    time.sleep(5)  # Wait for servers to start
+    """Open the browser once the frontend is up."""
+    if not wait_ready("http://localhost:3000", timeout=60):
+        print("Frontend did not start in time, opening the browser anyway")
     try:
         webbrowser.open("http://localhost:3000")
     except Exception as e:
@@ -109,8 +124,9 @@ if __name__ == "__main__":
     backend_thread.daemon = True
     backend_thread.start()
     
-    # Wait a moment for the backend to start
-    time.sleep(2)
+    # Wait for the backend to start
+    if not wait_ready("http://127.0.0.1:5000/api/health"):
+        print("Warning: Backend is not responding on /api/health yet")
     
     # Open the browser in a separate thread
     browser_thread = Thread(target=open_browser)